@@ -1,6 +1,12 @@
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, g
 from flask_cors import CORS
+import os
+import json
+import math
+import time
 import pickle
+import threading
+from itertools import product
 import pandas as pd
 import numpy as np
 from pymongo import MongoClient
@@ -11,7 +17,10 @@ from bson.objectid import ObjectId
 app = Flask(__name__)
 
 # Configurer CORS pour permettre les requêtes locales
-CORS(app, resources={r"/predict": {"origins": ["http://localhost:3000", "http://localhost:5173"]}})
+CORS(app, resources={
+    r"/predict": {"origins": ["http://localhost:3000", "http://localhost:5173"]},
+    r"/predict/scenarios": {"origins": ["http://localhost:3000", "http://localhost:5173"]},
+})
 
 # Charger les modèles et le scaler sauvegardés
 try:
@@ -39,6 +48,29 @@ except Exception as e:
     print(f"Erreur lors de la connexion à MongoDB : {e}")
     raise RuntimeError("Impossible de se connecter à MongoDB. Arrêt du programme.")
 
+# Enregistrement optionnel du trafic /predict (JSONL) pour benchmarks/replay_traffic.py
+TRAFFIC_LOG = os.getenv('EYA_TRAFFIC_LOG')
+traffic_lock = threading.Lock()
+
+if TRAFFIC_LOG:
+    @app.before_request
+    def start_request_timer():
+        g.request_start = time.perf_counter()
+
+    @app.after_request
+    def record_traffic(response):
+        if request.path == '/predict':
+            record = {
+                'ts': time.time(),
+                'service': 'predict',
+                'request': request.get_json(silent=True),
+                'status': response.status_code,
+                'duration_ms': round((time.perf_counter() - g.request_start) * 1000, 3),
+            }
+            with traffic_lock, open(TRAFFIC_LOG, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record) + '\n')
+        return response
+
 # Définir les features attendues par le modèle
 features = [
     'duration_days', 'cost_ratio', 'time_ratio', 'team_size',
@@ -141,6 +173,47 @@ def calculate_features(project, resources, workspace):
         print(f"Erreur lors du calcul des features: {e}")
         raise
 
+# Charger le projet, ses ressources et son workspace depuis MongoDB.
+# Retourne (project, resources, workspace, None) ou (None, None, None, réponse d'erreur).
+def load_project_data(project_id):
+    # Convertir le projectId en ObjectId
+    try:
+        project_object_id = ObjectId(project_id)
+        print(f"projectId converti en ObjectId: {project_object_id}")
+    except Exception as e:
+        print(f"Erreur lors de la conversion du projectId: {e}")
+        return None, None, None, (jsonify({'error': 'projectId invalide'}), 400)
+
+    # Récupérer le projet spécifique depuis MongoDB
+    project = projects_collection.find_one({'_id': project_object_id})
+    print(f"Projet récupéré: {project}")
+    if not project:
+        print(f"Projet non trouvé pour l'ID {project_id}")
+        return None, None, None, (jsonify({'error': f"Projet avec l'ID {project_id} non trouvé"}), 404)
+
+    # Récupérer les ressources du projet
+    resources = list(resources_collection.find({'project_id': project_object_id}))
+    print(f"Ressources récupérées: {resources}")
+    if not resources:
+        print(f"Aucune ressource trouvée pour le projet {project_id}")
+        return None, None, None, (jsonify({'error': f"Aucune ressource trouvée pour le projet {project_id}"}), 404)
+
+    # Trouver le workspace qui contient ce projet dans sa liste projects
+    workspace = workspaces_collection.find_one({'projects': project_object_id})
+    print(f"Workspace récupéré: {workspace}")
+    if not workspace:
+        print(f"Workspace non trouvé pour le projet {project_id}")
+        return None, None, None, (jsonify({'error': f"Workspace non trouvé pour le projet {project_id}"}), 404)
+    return project, resources, workspace, None
+
+# Standardiser puis prédire en une seule passe pour toutes les lignes de input_data
+def score_features(input_data):
+    input_scaled = scaler.transform(input_data)
+    pred_delay = rf_classifier.predict(input_scaled)
+    # Ajuster time_diff pour éviter les valeurs négatives
+    pred_time_diff = np.maximum(rf_regressor.predict(input_scaled), 0.0)
+    return pred_delay, pred_time_diff
+
 # Route pour la prédiction d'un projet spécifique
 @app.route('/predict', methods=['POST'])
 def predict():
@@ -154,51 +227,18 @@ def predict():
             print("Erreur: projectId manquant")
             return jsonify({'error': 'projectId est requis dans le corps de la requête'}), 400
 
-        # Convertir le projectId en ObjectId
-        try:
-            project_object_id = ObjectId(project_id)
-            print(f"projectId converti en ObjectId: {project_object_id}")
-        except Exception as e:
-            print(f"Erreur lors de la conversion du projectId: {e}")
-            return jsonify({'error': 'projectId invalide'}), 400
-
-        # Récupérer le projet spécifique depuis MongoDB
-        project = projects_collection.find_one({'_id': project_object_id})
-        print(f"Projet récupéré: {project}")
-        if not project:
-            print(f"Projet non trouvé pour l'ID {project_id}")
-            return jsonify({'error': f"Projet avec l'ID {project_id} non trouvé"}), 404
-
-        # Récupérer les ressources du projet
-        resources = list(resources_collection.find({'project_id': project_object_id}))
-        print(f"Ressources récupérées: {resources}")
-        if not resources:
-            print(f"Aucune ressource trouvée pour le projet {project_id}")
-            return jsonify({'error': f"Aucune ressource trouvée pour le projet {project_id}"}), 404
-
-        # Trouver le workspace qui contient ce projet dans sa liste projects
-        workspace = workspaces_collection.find_one({'projects': project_object_id})
-        print(f"Workspace récupéré: {workspace}")
-        if not workspace:
-            print(f"Workspace non trouvé pour le projet {project_id}")
-            return jsonify({'error': f"Workspace non trouvé pour le projet {project_id}"}), 404
+        project, resources, workspace, error = load_project_data(project_id)
+        if error:
+            return error
 
         # Calculer les features à partir des données MongoDB
         project_data = calculate_features(project, resources, workspace)
         print(f"Features calculées: {project_data}")
 
-        # Convertir les données en DataFrame
+        # Convertir les données en DataFrame et prédire
         input_data = pd.DataFrame([project_data], columns=features)
-
-        # Standardiser les données
-        input_scaled = scaler.transform(input_data)
-
-        # Faire les prédictions
-        pred_delay = rf_classifier.predict(input_scaled)
-        pred_time_diff = rf_regressor.predict(input_scaled)
-
-        # Ajuster time_diff pour éviter les valeurs négatives
-        time_diff = max(0.0, float(pred_time_diff[0]))
+        pred_delay, pred_time_diff = score_features(input_data)
+        time_diff = float(pred_time_diff[0])
 
         # Créer le résultat de la prédiction
         result = {
@@ -215,6 +255,122 @@ def predict():
         print(f"Erreur complète lors de la prédiction: {e}")
         return jsonify({'error': str(e)}), 500
 
+# Nombre maximal de variantes évaluées par requête /predict/scenarios
+MAX_SCENARIOS = 10000
+
+# Construire la matrice des variantes (une ligne par variante) à partir de la ligne de base.
+# body contient soit 'grid' ({feature: [valeurs]}, produit cartésien), soit 'overrides'
+# ([{feature: valeur}, ...]). Retourne (matrice, liste des overrides) ou lève ValueError.
+def build_scenarios(base_row, body):
+    grid = body.get('grid')
+    overrides = body.get('overrides')
+    if (grid is None) == (overrides is None):
+        raise ValueError("Fournir soit 'grid', soit 'overrides'")
+
+    if grid is not None:
+        if not isinstance(grid, dict) or not grid:
+            raise ValueError("'grid' doit être un objet {feature: [valeurs]}")
+        names = list(grid)
+        values = [grid[n] if isinstance(grid[n], list) else [grid[n]] for n in names]
+        # math.prod sur des int Python : pas de débordement int64 comme np.prod
+        count = math.prod(len(v) for v in values)
+        if count < 1 or count > MAX_SCENARIOS:
+            raise ValueError(f"{count} variantes demandées, entre 1 et {MAX_SCENARIOS} attendues")
+        combos = list(product(*values))
+        columns = np.array(combos, dtype=float).reshape(count, len(names))
+        present = np.ones(columns.shape, dtype=bool)
+        overrides = [dict(zip(names, c)) for c in combos]
+    else:
+        if not isinstance(overrides, list) or not all(isinstance(o, dict) for o in overrides):
+            raise ValueError("'overrides' doit être une liste d'objets {feature: valeur}")
+        if not overrides or len(overrides) > MAX_SCENARIOS:
+            raise ValueError(f"{len(overrides)} variantes demandées, entre 1 et {MAX_SCENARIOS} attendues")
+        names = sorted({n for o in overrides for n in o})
+        columns = np.array([[o.get(n, np.nan) for n in names] for o in overrides],
+                           dtype=float).reshape(len(overrides), len(names))
+        # present[i, j] : la variante i fixe la feature j
+        present = np.array([[n in o for n in names] for o in overrides],
+                           dtype=bool).reshape(len(overrides), len(names))
+
+    unknown = [n for n in names if n not in features]
+    if unknown:
+        raise ValueError(f"Features inconnues: {unknown}. Features valides: {features}")
+    # null, NaN ou infini deviendraient NaN et garderaient silencieusement la valeur de base
+    invalid = present & ~np.isfinite(columns)
+    if invalid.any():
+        bad = sorted({names[j] for j in np.nonzero(invalid)[1]})
+        raise ValueError(f"Valeurs nulles ou non finies pour: {bad}")
+
+    matrix = np.tile(np.array([base_row[f] for f in features], dtype=float), (len(overrides), 1))
+    for j, name in enumerate(names):
+        idx = features.index(name)
+        matrix[:, idx] = np.where(present[:, j], columns[:, j], matrix[:, idx])
+
+    # cost_ratio dérive des coûts : le recalculer, variante par variante, si un
+    # coût change sans cost_ratio explicite dans la même variante
+    def given(name):
+        return present[:, names.index(name)] if name in names else np.zeros(len(overrides), dtype=bool)
+    recompute = (given('allocated_cost') | given('estimated_cost')) & ~given('cost_ratio')
+    if recompute.any():
+        est = matrix[:, features.index('estimated_cost')]
+        alloc = matrix[:, features.index('allocated_cost')]
+        safe_est = np.where(est > 0, est, 1.0)
+        ratio = np.where(est > 0, alloc / safe_est, 1.0)
+        idx = features.index('cost_ratio')
+        matrix[:, idx] = np.where(recompute, ratio, matrix[:, idx])
+    return matrix, overrides
+
+# Route what-if : évaluer de nombreuses variantes d'un projet en une seule passe
+@app.route('/predict/scenarios', methods=['POST'])
+def predict_scenarios():
+    try:
+        data = request.get_json() or {}
+        project_id = data.get('projectId')
+        if not project_id:
+            return jsonify({'error': 'projectId est requis dans le corps de la requête'}), 400
+
+        project, resources, workspace, error = load_project_data(project_id)
+        if error:
+            return error
+
+        # Les features de base ne sont calculées (et lues dans MongoDB) qu'une seule fois
+        base_row = calculate_features(project, resources, workspace)
+        try:
+            matrix, overrides = build_scenarios(base_row, data)
+        except (ValueError, TypeError) as e:
+            return jsonify({'error': str(e)}), 400
+
+        # Ligne de base en tête : une seule passe scaler + forêts pour tout le lot
+        base = np.array([[base_row[f] for f in features]], dtype=float)
+        pred_delay, pred_time_diff = score_features(pd.DataFrame(np.vstack([base, matrix]), columns=features))
+        base_delay, base_time_diff = pred_delay[:1], pred_time_diff[:1]
+        pred_delay, pred_time_diff = pred_delay[1:], pred_time_diff[1:]
+
+        result = {
+            'project_id': str(project['_id']),
+            'project_name': project['project_name'],
+            'base': {
+                'features': base_row,
+                'is_delayed': 'En retard' if base_delay[0] == 1 else 'À temps',
+                'time_diff': float(base_time_diff[0])
+            },
+            'count': len(overrides),
+            'scenarios': [
+                {
+                    'overrides': o,
+                    'is_delayed': 'En retard' if d == 1 else 'À temps',
+                    'time_diff': t
+                }
+                for o, d, t in zip(overrides, pred_delay.tolist(), pred_time_diff.tolist())
+            ]
+        }
+        print(f"{len(overrides)} scénarios évalués pour le projet {project_id}")
+        return jsonify(result), 200
+
+    except Exception as e:
+        print(f"Erreur lors de l'évaluation des scénarios: {e}")
+        return jsonify({'error': str(e)}), 500
+
 # Route de test pour vérifier que l'API fonctionne
 @app.route('/', methods=['GET'])
 def home():
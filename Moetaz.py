@@ -1,10 +1,15 @@
+import time
+# Started before the spaCy / sentence-transformers imports so the recorded
+# duration_ms covers the whole script run, as replay_traffic.py measures it
+request_start = time.perf_counter()
+
 import spacy
 from sentence_transformers import SentenceTransformer, util
 from pymongo import MongoClient
 import argparse
 import json
+import os
 import sys
-import time
 
 # Modify the logging function to send logs only to stderr, not stdout
 def log(message):
@@ -12,7 +17,21 @@ def log(message):
     timestamp = time.strftime("%H:%M:%S", time.localtime())
     print(f"[{timestamp}] {message}", file=sys.stderr, flush=True)
 
-# Log start time
+def record_traffic(workspace_id, task_description, status, started):
+    """Append this matching request to MOETAZ_TRAFFIC_LOG (JSONL) for benchmarks/replay_traffic.py"""
+    path = os.getenv("MOETAZ_TRAFFIC_LOG")
+    if not path:
+        return
+    record = {
+        "ts": time.time(),
+        "service": "match",
+        "request": {"workspace_id": workspace_id, "task_description": task_description},
+        "status": status,
+        "duration_ms": round((time.perf_counter() - started) * 1000, 3),
+    }
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(record) + "\n")
+
 log("Script started")
 
 # Connexion MongoDB
@@ -161,11 +180,13 @@ if __name__ == "__main__":
                 
                 # Print as JSON for the API to parse
                 print(json.dumps(matched_profiles))
+            record_traffic(args.workspace_id, args.task_description, 200, request_start)
                 
         except Exception as e:
             error_message = f"Error in Python script: {str(e)}"
             log(error_message)
             print(json.dumps({"error": str(e)}))
+            record_traffic(args.workspace_id, args.task_description, 500, request_start)
             sys.exit(1)
     else:
         from bson.objectid import ObjectId
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""Microbenchmark for the CVParser extraction stage on large synthetic CV texts.
+
+OCR is skipped (CVParser.parse_text), so this measures only segmentation and
+the section extractors. The previous per-line/per-header segmentation loop is
+kept here as a reference to check equivalence and compare timings.
+
+Usage:
+    python benchmarks/bench_cv_extraction.py --cvs 200 --lines 400
+"""
+import os
+import sys
+import json
+import time
+import random
+import logging
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from cv_parser_ocr import CVParser, SECTION_HEADERS, logger as parser_logger
+
+FIRST = ['John', 'Amira', 'Malek', 'Sarah', 'Youssef', 'Ines', 'David', 'Eya']
+LAST = ['Smith', 'Ben Ali', 'Jendoubi', 'Trabelsi', 'Martin', 'Haddad']
+SKILLS = ['Python', 'Docker', 'React', 'Node.js', 'MongoDB', 'Kubernetes', 'SQL', 'Figma']
+LANGS = ['English - fluent', 'French - native', 'Arabic - native', 'German - basic']
+FILLER = ['Delivered features on time', 'Led a team of four', 'Improved build speed',
+          'Wrote integration tests', 'Worked with stakeholders on requirements']
+
+
+def synthetic_cv(rng, n_lines, named_email=True):
+    """Build a CV text of roughly n_lines lines touching every section.
+
+    With named_email=False the address does not contain the name, so
+    CVParser has to fall back to NER.
+    """
+    first, last = rng.choice(FIRST), rng.choice(LAST)
+    local = f"{first.lower()}.{last.lower().replace(' ', '')}" if named_email else f"contact{rng.randint(1, 999)}"
+    out = [f"{first} {last}", f"{local}@example.com",
+           f"+216 {rng.randint(20, 99)} {rng.randint(100, 999)} {rng.randint(100, 999)}",
+           'Summary', 'Engineer with experience building web platforms.']
+    body = {
+        'skills': lambda: f"- {rng.choice(SKILLS)}",
+        'languages': lambda: f"• {rng.choice(LANGS)}",
+        'experience': lambda: (f"Developer - Company{rng.randint(1, 99)} {rng.randint(2010, 2020)} - Present"
+                               if rng.random() < 0.3 else f"- {rng.choice(FILLER)}"),
+        'education': lambda: f"University {rng.randint(1, 20)} {rng.randint(2005, 2015)}",
+        'certifications': lambda: f"Cert {rng.randint(1, 50)} - Issuer Jan {rng.randint(2015, 2024)}",
+        'hobbies': lambda: rng.choice(['Chess', 'Running', 'Reading']),
+    }
+    secs = list(body)
+    while len(out) < n_lines:
+        sec = rng.choice(secs)
+        out.append(rng.choice(SECTION_HEADERS[sec]).title())
+        out.extend(body[sec]() for _ in range(rng.randint(3, 12)))
+    return '\n'.join(out[:n_lines])
+
+
+def legacy_segment(lines):
+    """Reference copy of the nested header loop CVParser used before."""
+    cur = 'header'
+    sections = {cur: []}
+    for L in lines:
+        low = L.lower()
+        for sec, heads in SECTION_HEADERS.items():
+            if any(low.startswith(h) for h in heads):
+                cur = sec
+                sections.setdefault(cur, [])
+                break
+        sections.setdefault(cur, []).append(L)
+    return sections
+
+
+def best_of(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    ap = argparse.ArgumentParser(description='Benchmark CVParser extraction without OCR')
+    ap.add_argument('--cvs', type=int, default=200, help='Number of synthetic CVs')
+    ap.add_argument('--lines', type=int, default=400, help='Lines per synthetic CV')
+    ap.add_argument('--repeat', type=int, default=5)
+    ap.add_argument('--seed', type=int, default=42)
+    args = ap.parse_args()
+
+    parser_logger.setLevel(logging.WARNING)
+    rng = random.Random(args.seed)
+    texts = [synthetic_cv(rng, args.lines) for _ in range(args.cvs)]
+
+    # Equivalence check against the reference segmentation
+    for text in texts:
+        p = CVParser('<synthetic>')
+        p.parse_text(text)
+        assert p.sections == legacy_segment(p.lines), 'segmentation differs from reference'
+
+    line_lists = [[L.strip() for L in t.splitlines() if L.strip()] for t in texts]
+
+    def run_legacy_segment():
+        for lines in line_lists:
+            legacy_segment(lines)
+
+    def run_segment():
+        for lines in line_lists:
+            p = CVParser('<synthetic>')
+            p.lines = lines
+            p._segment()
+
+    def run_parse_text():
+        for text in texts:
+            CVParser('<synthetic>').parse_text(text)
+
+    total_lines = sum(len(lines) for lines in line_lists)
+    results = {}
+    for name, fn in [('legacy_segment', run_legacy_segment),
+                     ('segment', run_segment),
+                     ('parse_text', run_parse_text)]:
+        t = best_of(fn, args.repeat)
+        results[name] = {'seconds': round(t, 4),
+                         'cvs_per_s': round(args.cvs / t, 1),
+                         'lines_per_s': round(total_lines / t)}
+    results['segment_speedup'] = round(results['legacy_segment']['seconds'] / results['segment']['seconds'], 2)
+    print(json.dumps({'cvs': args.cvs, 'lines': total_lines, 'results': results}, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""Throughput comparison of per-document spaCy NER against batched NER-only nlp.pipe.
+
+The synthetic CVs use email addresses without the person's name, so every
+document reaches the NER step of CVParser._extract_name. Requires spaCy and
+en_core_web_sm, or --model pointing at another pipeline directory.
+
+Usage:
+    python benchmarks/bench_ner.py --cvs 500 --batch-size 64
+"""
+import os
+import sys
+import json
+import time
+import random
+import logging
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+import cv_parser_ocr
+from cv_parser_ocr import CVParser, parse_loaded, logger as parser_logger
+from bench_cv_extraction import synthetic_cv
+
+
+def timed(fn):
+    start = time.perf_counter()
+    out = fn()
+    return out, time.perf_counter() - start
+
+
+def main():
+    ap = argparse.ArgumentParser(description='Compare per-document and batched NER name extraction')
+    ap.add_argument('--cvs', type=int, default=500, help='Number of synthetic CVs')
+    ap.add_argument('--lines', type=int, default=60, help='Lines per synthetic CV')
+    ap.add_argument('--batch-size', type=int, default=64)
+    ap.add_argument('--n-process', type=int, default=1, help='Processes used by nlp.pipe')
+    ap.add_argument('--seed', type=int, default=42)
+    ap.add_argument('--model', help='spaCy pipeline name or path to use instead of en_core_web_sm')
+    args = ap.parse_args()
+
+    if args.model:
+        import spacy
+        cv_parser_ocr.nlp = spacy.load(args.model)
+        cv_parser_ocr.HAS_SPACY = True
+    if not cv_parser_ocr.HAS_SPACY:
+        print(json.dumps({'error': 'spaCy or en_core_web_sm is not installed'}))
+        sys.exit(1)
+
+    parser_logger.setLevel(logging.WARNING)
+    rng = random.Random(args.seed)
+    texts = [synthetic_cv(rng, args.lines, named_email=False) for _ in range(args.cvs)]
+
+    per_doc, t_per_doc = timed(lambda: [CVParser('<synthetic>').parse_text(t) for t in texts])
+    batched, t_batched = timed(lambda: parse_loaded(
+        [CVParser('<synthetic>').set_text(t) for t in texts], args.batch_size, args.n_process))
+
+    same = sum(a['fullName'] == b['fullName'] for a, b in zip(per_doc, batched))
+    print(json.dumps({
+        'model': args.model or 'en_core_web_sm',
+        'cvs': args.cvs,
+        'batch_size': args.batch_size,
+        'n_process': args.n_process,
+        'pipeline': cv_parser_ocr.nlp.pipe_names,
+        'ner_pipes': cv_parser_ocr._ner_only_pipes(),
+        'per_document': {'seconds': round(t_per_doc, 3), 'cvs_per_s': round(args.cvs / t_per_doc, 1)},
+        'batched': {'seconds': round(t_batched, 3), 'cvs_per_s': round(args.cvs / t_batched, 1)},
+        'speedup': round(t_per_doc / t_batched, 2),
+        'same_name': f"{same}/{args.cvs}",
+    }, indent=2))
+
+
+if __name__ == '__main__':
+    main()
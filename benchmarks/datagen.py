@@ -0,0 +1,89 @@
+"""Synthetic MongoDB documents for the benchmark suite.
+
+Field names follow what Eya.py and Moetaz.py read from the ProjectManagement
+database, not the full Mongoose schemas.
+"""
+import random
+from datetime import datetime, timedelta
+from bson.objectid import ObjectId
+
+RESOURCE_TYPES = ['Financier', 'Humain', 'Matériel']
+SKILLS = ['Python', 'JavaScript', 'React', 'Node.js', 'MongoDB', 'Docker', 'Kubernetes',
+          'Machine Learning', 'SQL', 'Figma', 'UI Design', 'Testing', 'DevOps', 'Java',
+          'Spring', 'Angular', 'Data Analysis', 'Project Management', 'Scrum', 'AWS']
+FIRST = ['Malek', 'Eya', 'Moetaz', 'Amira', 'Youssef', 'Ines', 'Sarah', 'Omar', 'Lina', 'Karim']
+LAST = ['Jendoubi', 'Trabelsi', 'Ben Ali', 'Haddad', 'Mansour', 'Gharbi', 'Saidi', 'Khelifi']
+
+
+def eya_dataset(n_resources, n_history, seed=0):
+    """One project with n_resources resources, in a workspace with n_history completed projects.
+
+    Returns (project_id, {'projects': [...], 'ressources': [...], 'workspaces': [...]}).
+    """
+    rng = random.Random(seed)
+    start = datetime(2025, 1, 1) + timedelta(days=rng.randint(0, 300))
+    project_id = ObjectId()
+    project = {
+        '_id': project_id,
+        'project_name': f'Bench project {seed}',
+        'status': 'in progress',
+        'start_date': start,
+        'end_date': start + timedelta(days=rng.randint(30, 365)),
+    }
+
+    resources = []
+    for _ in range(n_resources):
+        estimated = rng.uniform(500, 50000)
+        resources.append({
+            '_id': ObjectId(),
+            'project_id': project_id,
+            'resource_type': rng.choice(RESOURCE_TYPES),
+            'estimated_cost': round(estimated, 2),
+            'allocated_cost': round(estimated * rng.uniform(0.7, 1.3), 2),
+            'team_size': rng.randint(1, 8),
+        })
+
+    history = []
+    for _ in range(n_history):
+        h_start = start - timedelta(days=rng.randint(60, 1500))
+        h_end = h_start + timedelta(days=rng.randint(20, 300))
+        estimated = rng.uniform(1000, 100000)
+        history.append({
+            '_id': ObjectId(),
+            'project_name': 'Past project',
+            'status': 'completed',
+            'start_date': h_start,
+            'end_date': h_end,
+            'actual_end_date': h_end + timedelta(days=rng.randint(-10, 60)),
+            'estimated_cost': round(estimated, 2),
+            'actual_cost': round(estimated * rng.uniform(0.8, 1.5), 2),
+        })
+
+    workspace = {'_id': ObjectId(), 'name': 'Bench workspace',
+                 'projects': [project_id] + [h['_id'] for h in history]}
+    return project_id, {'projects': [project] + history, 'ressources': resources, 'workspaces': [workspace]}
+
+
+def moetaz_dataset(n_members, seed=0):
+    """A workspace with an owner and n_members members, each with a few skills.
+
+    Returns (workspace_id, {'users': [...], 'workspaces': [...]}).
+    """
+    rng = random.Random(seed)
+    users = [{
+        '_id': ObjectId(),
+        'name': f"{rng.choice(FIRST)} {rng.choice(LAST)}",
+        'skills': rng.sample(SKILLS, rng.randint(2, 8)),
+    } for _ in range(n_members + 1)]
+    workspace = {
+        '_id': ObjectId(),
+        'owner': users[0]['_id'],
+        'members': [{'user': u['_id'], 'role': rng.choice(['editor', 'viewer'])} for u in users[1:]],
+    }
+    return workspace['_id'], {'users': users, 'workspaces': [workspace]}
+
+
+def task_description(seed=0):
+    rng = random.Random(seed)
+    return (f"Build a {rng.choice(['dashboard', 'REST API', 'mobile screen', 'data pipeline'])} "
+            f"using {', '.join(rng.sample(SKILLS, 3))} and deploy it to staging.")
@@ -0,0 +1,56 @@
+"""In-memory stand-in for the parts of pymongo the Python services use.
+
+Supports find/find_one with equality, {'$in': [...]} and array-contains
+matching, which covers Eya.py and Moetaz.py. Lookups on _id go through a
+dict index, like Mongo's primary key index; other fields are scanned.
+"""
+
+
+def _matches(doc, query):
+    for field, cond in query.items():
+        value = doc.get(field)
+        if isinstance(cond, dict) and '$in' in cond:
+            options = cond['$in']
+            if isinstance(value, list):
+                if not any(v in options for v in value):
+                    return False
+            elif value not in options:
+                return False
+        elif isinstance(value, list) and not isinstance(cond, list):
+            if cond not in value:
+                return False
+        elif value != cond:
+            return False
+    return True
+
+
+class InMemoryCollection:
+    def __init__(self, docs=()):
+        self.docs = {}
+        self.insert_many(docs)
+
+    def insert_many(self, docs):
+        for d in docs:
+            self.docs[d['_id']] = d
+
+    def _candidates(self, query):
+        key = query.get('_id')
+        if key is None:
+            return self.docs.values()
+        if isinstance(key, dict) and '$in' in key:
+            return [self.docs[k] for k in key['$in'] if k in self.docs]
+        return [self.docs[key]] if key in self.docs else []
+
+    def find(self, query=None):
+        query = query or {}
+        rest = {k: v for k, v in query.items() if k != '_id'}
+        return iter([dict(d) for d in self._candidates(query) if _matches(d, rest)])
+
+    def find_one(self, query=None):
+        return next(self.find(query), None)
+
+
+class InMemoryDB(dict):
+    def __missing__(self, name):
+        self[name] = InMemoryCollection()
+        return self[name]
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""Replay recorded /predict and profile-matching traffic against local services.
+
+Recording:
+    EYA_TRAFFIC_LOG=traffic.jsonl python Eya.py
+    MOETAZ_TRAFFIC_LOG=traffic.jsonl  (set in the Node server's environment)
+
+Each line is {"ts", "service": "predict"|"match", "request", "status", "duration_ms"}.
+For match, duration_ms runs from the first line of Moetaz.py (model imports
+included) to its exit, so recorded_p50_ms compares with a --match-cli replay
+up to interpreter startup; over HTTP the Node spawn overhead is extra.
+
+Replay keeps the recorded inter-arrival times divided by --speedup (0 sends
+as fast as --concurrency allows). predict goes to Eya.py over HTTP. match goes
+to the Node /api/match-profiles route, which spawns Moetaz.py, or with
+--match-cli straight to Moetaz.py as a subprocess.
+
+Usage:
+    python benchmarks/replay_traffic.py traffic.jsonl --concurrency 8 --speedup 4
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+import subprocess
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from run_suite import percentile
+
+
+def load_records(path, services):
+    records = []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            rec = json.loads(line)
+            if rec.get('service') in services:
+                records.append(rec)
+    records.sort(key=lambda r: r['ts'])
+    return records
+
+
+class Replayer:
+    def __init__(self, args):
+        self.args = args
+        self.local = threading.local()
+
+    def session(self):
+        if not hasattr(self.local, 'session'):
+            self.local.session = requests.Session()
+        return self.local.session
+
+    def send(self, rec):
+        """Send one recorded request; returns the status code or an error string"""
+        body = rec['request'] or {}
+        if rec['service'] == 'predict':
+            resp = self.session().post(self.args.eya_url, json=body, timeout=self.args.timeout)
+            return resp.status_code
+        if self.args.match_cli:
+            proc = subprocess.run(
+                [self.args.python, os.path.join(ROOT, 'Moetaz.py'),
+                 '--workspace_id', body['workspace_id'], '--task_description', body['task_description']],
+                capture_output=True, timeout=self.args.timeout)
+            return 200 if proc.returncode == 0 else 500
+        resp = self.session().post(self.args.match_url, json=body, timeout=self.args.timeout)
+        return resp.status_code
+
+    def run_one(self, rec, due):
+        started = time.perf_counter()
+        try:
+            status = self.send(rec)
+        except Exception as e:
+            status = type(e).__name__
+        return {'service': rec['service'], 'status': status,
+                'latency_s': time.perf_counter() - started,
+                'lag_s': max(0.0, started - due),
+                'recorded_ms': rec.get('duration_ms')}
+
+    def replay(self, records):
+        if not records:
+            return [], 0.0
+        t0 = records[0]['ts']
+        start = time.perf_counter()
+        futures = []
+        with ThreadPoolExecutor(self.args.concurrency) as pool:
+            for rec in records:
+                due = start + ((rec['ts'] - t0) / self.args.speedup if self.args.speedup > 0 else 0.0)
+                delay = due - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                futures.append(pool.submit(self.run_one, rec, due))
+            results = [f.result() for f in futures]
+        return results, time.perf_counter() - start
+
+
+def summarize(results, elapsed):
+    report = {}
+    for service in sorted({r['service'] for r in results}):
+        rows = [r for r in results if r['service'] == service]
+        lat = sorted(r['latency_s'] for r in rows)
+        recorded = sorted(r['recorded_ms'] for r in rows if r['recorded_ms'] is not None)
+        errors = sum(1 for r in rows if not (isinstance(r['status'], int) and r['status'] < 400))
+        report[service] = {
+            'requests': len(rows),
+            'errors': errors,
+            'error_rate': round(errors / len(rows), 4),
+            'status': dict(Counter(str(r['status']) for r in rows)),
+            'p50_ms': round(percentile(lat, 50) * 1000, 3),
+            'p90_ms': round(percentile(lat, 90) * 1000, 3),
+            'p99_ms': round(percentile(lat, 99) * 1000, 3),
+            'max_ms': round(lat[-1] * 1000, 3),
+            'throughput_per_s': round(len(rows) / elapsed, 2) if elapsed else 0.0,
+            'max_lag_ms': round(max(r['lag_s'] for r in rows) * 1000, 3),
+            'recorded_p50_ms': round(percentile(recorded, 50), 3) if recorded else None,
+            'recorded_p99_ms': round(percentile(recorded, 99), 3) if recorded else None,
+        }
+    return report
+
+
+def main():
+    ap = argparse.ArgumentParser(description='Replay recorded predict/match traffic')
+    ap.add_argument('log', help='JSONL traffic log recorded by Eya.py / Moetaz.py')
+    ap.add_argument('--services', nargs='+', choices=['predict', 'match'], default=['predict', 'match'])
+    ap.add_argument('--concurrency', type=int, default=4, help='Requests in flight at most')
+    ap.add_argument('--speedup', type=float, default=1.0,
+                    help='Divide recorded inter-arrival gaps by this factor; 0 = no pacing')
+    ap.add_argument('--eya-url', default='http://127.0.0.1:5000/predict')
+    ap.add_argument('--match-url', default='http://127.0.0.1:3000/api/match-profiles')
+    ap.add_argument('--match-cli', action='store_true', help='Run Moetaz.py directly instead of via HTTP')
+    ap.add_argument('--python', default=sys.executable, help='Interpreter for --match-cli')
+    ap.add_argument('--timeout', type=float, default=120.0, help='Per-request timeout in seconds')
+    ap.add_argument('--output', help='Write the JSON report to this file as well as stdout')
+    args = ap.parse_args()
+
+    records = load_records(args.log, set(args.services))
+    results, elapsed = Replayer(args).replay(records)
+    report = {
+        'log': args.log,
+        'concurrency': args.concurrency,
+        'speedup': args.speedup,
+        'elapsed_s': round(elapsed, 3),
+        'services': summarize(results, elapsed),
+    }
+    out = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(out + '\n')
+    print(out)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""End-to-end benchmark suite for the Python services, runnable without MongoDB.
+
+Each suite runs against synthetic data served by an in-memory Mongo stand-in:
+  eya        Eya.py POST /predict, varying resource count and workspace history
+  scenarios  Eya.py POST /predict/scenarios, varying the number of variants
+  moetaz     Moetaz.py get_profiles_from_workspace + match_profiles, varying members
+  cv         CVParser.parse on sample documents, text and layout OCR modes (needs Tesseract)
+
+Results (p50/p99 latency, throughput, peak traced memory) are printed as JSON.
+The exit code is 1 when any suite raised an error. With --baseline, a previous
+result file is compared and the exit code is also 1 when any scenario's p50
+regressed by more than --tolerance, or when a baseline scenario is missing from
+this run (listed under "missing").
+
+Moetaz needs its spaCy and sentence-transformers models already cached locally.
+
+Usage:
+    python benchmarks/run_suite.py --suite eya moetaz --output bench.json
+    python benchmarks/run_suite.py --baseline bench.json --tolerance 0.2
+"""
+import os
+import io
+import sys
+import json
+import math
+import time
+import platform
+import argparse
+import tracemalloc
+from contextlib import redirect_stdout, redirect_stderr
+from datetime import datetime
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from mongo_standin import InMemoryCollection, InMemoryDB
+
+try:
+    import resource
+    HAS_RESOURCE = True
+except ImportError:
+    HAS_RESOURCE = False
+
+
+def percentile(sorted_values, p):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    k = max(0, math.ceil(p / 100 * len(sorted_values)) - 1)
+    return sorted_values[k]
+
+
+def measure(fn, n, warmup=2):
+    """Call fn n times and return latency, throughput and memory statistics"""
+    for _ in range(warmup):
+        fn()
+    latencies = []
+    start = time.perf_counter()
+    for _ in range(n):
+        t0 = time.perf_counter()
+        fn()
+        latencies.append(time.perf_counter() - t0)
+    total = time.perf_counter() - start
+
+    # Memory is traced on one extra call so tracemalloc does not skew latencies
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    latencies.sort()
+    out = {
+        'n': n,
+        'p50_ms': round(percentile(latencies, 50) * 1000, 3),
+        'p99_ms': round(percentile(latencies, 99) * 1000, 3),
+        'mean_ms': round(sum(latencies) / n * 1000, 3),
+        'max_ms': round(latencies[-1] * 1000, 3),
+        'throughput_per_s': round(n / total, 2),
+        'peak_mem_kb': round(peak / 1024, 1),
+    }
+    if HAS_RESOURCE:
+        out['max_rss_kb'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return out
+
+
+def run_eya(args):
+    from datagen import eya_dataset
+    with redirect_stdout(io.StringIO()):
+        import Eya
+    client = Eya.app.test_client()
+    results = []
+    for n_res in args.eya_resources:
+        for n_hist in args.eya_history:
+            project_id, data = eya_dataset(n_res, n_hist, seed=n_res * 1000 + n_hist)
+            Eya.projects_collection = InMemoryCollection(data['projects'])
+            Eya.resources_collection = InMemoryCollection(data['ressources'])
+            Eya.workspaces_collection = InMemoryCollection(data['workspaces'])
+            body = {'projectId': str(project_id)}
+
+            def call():
+                resp = client.post('/predict', json=body)
+                if resp.status_code != 200:
+                    raise RuntimeError(f"/predict returned {resp.status_code}: {resp.get_data(as_text=True)}")
+
+            # Eya.py prints every document it reads
+            with redirect_stdout(io.StringIO()):
+                stats = measure(call, args.requests)
+            results.append({'suite': 'eya', 'params': {'resources': n_res, 'history': n_hist}, **stats})
+    return results
+
+
+def run_scenarios(args):
+    from datagen import eya_dataset
+    with redirect_stdout(io.StringIO()):
+        import Eya
+    client = Eya.app.test_client()
+    project_id, data = eya_dataset(100, 100, seed=7)
+    Eya.projects_collection = InMemoryCollection(data['projects'])
+    Eya.resources_collection = InMemoryCollection(data['ressources'])
+    Eya.workspaces_collection = InMemoryCollection(data['workspaces'])
+    results = []
+    for count in args.scenario_counts:
+        overrides = [{'duration_days': 30 + i % 365, 'team_size': 1 + i // 365 % 50,
+                      'allocated_cost': 1000.0 * (1 + i % 97)} for i in range(count)]
+        body = {'projectId': str(project_id), 'overrides': overrides}
+
+        def call():
+            resp = client.post('/predict/scenarios', json=body)
+            if resp.status_code != 200:
+                raise RuntimeError(f"/predict/scenarios returned {resp.status_code}: {resp.get_data(as_text=True)}")
+
+        with redirect_stdout(io.StringIO()):
+            stats = measure(call, args.scenario_requests)
+        stats['variants_per_s'] = round(stats['throughput_per_s'] * count, 1)
+        results.append({'suite': 'scenarios', 'params': {'variants': count}, **stats})
+    return results
+
+
+def run_moetaz(args):
+    from datagen import moetaz_dataset, task_description
+    with redirect_stderr(io.StringIO()):
+        import Moetaz
+    results = []
+    for n_members in args.moetaz_members:
+        workspace_id, data = moetaz_dataset(n_members, seed=n_members)
+        Moetaz.db = InMemoryDB(users=InMemoryCollection(data['users']),
+                               workspaces=InMemoryCollection(data['workspaces']))
+        Moetaz.users_collection = Moetaz.db['users']
+        task = task_description(seed=n_members)
+
+        def call():
+            profiles = Moetaz.get_profiles_from_workspace(workspace_id)
+            Moetaz.match_profiles(task, profiles)
+
+        with redirect_stderr(io.StringIO()):
+            stats = measure(call, args.requests)
+        results.append({'suite': 'moetaz', 'params': {'members': n_members}, **stats})
+    return results
+
+
+def run_cv(args):
+    import logging
+    from cv_parser_ocr import CVParser, logger as parser_logger
+    parser_logger.setLevel(logging.WARNING)
+    results = []
+    for path in args.cv_files:
+        for mode in args.cv_modes:
+            # parse() falls back to the raw file bytes when OCR fails; timing that
+            # would record a fast, meaningless baseline
+            check = CVParser(path, ocr_mode=mode)
+            check.load_text()
+            if check.text_source != 'ocr':
+                raise RuntimeError(f"OCR produced no text for {path} in {mode} mode (is Tesseract installed?)")
+            stats = measure(lambda: CVParser(path, ocr_mode=mode).parse(), args.cv_requests, warmup=1)
+            stats['pages_per_s'] = round(stats['throughput_per_s'] * check.pages, 2)
+            results.append({'suite': 'cv', 'params': {'file': os.path.relpath(path, ROOT), 'ocr_mode': mode},
+                            **stats})
+    return results
+
+
+SUITES = {'eya': run_eya, 'scenarios': run_scenarios, 'moetaz': run_moetaz, 'cv': run_cv}
+
+
+def compare(results, baseline, tolerance):
+    """Return (regressions, missing) against the baseline.
+
+    regressions are scenarios whose p50 is more than tolerance slower; missing are
+    baseline scenarios with no measurement in results, e.g. because their suite failed.
+    """
+    key = lambda r: (r['suite'], json.dumps(r.get('params', {}), sort_keys=True))
+    before = {key(r): r for r in baseline['results'] if 'p50_ms' in r}
+    measured = {key(r) for r in results if 'p50_ms' in r}
+    regressions = []
+    for r in results:
+        old = before.get(key(r))
+        if old and 'p50_ms' in r and r['p50_ms'] > old['p50_ms'] * (1 + tolerance):
+            regressions.append({'suite': r['suite'], 'params': r['params'],
+                                'baseline_p50_ms': old['p50_ms'], 'p50_ms': r['p50_ms']})
+    missing = [{'suite': old['suite'], 'params': old.get('params', {})}
+               for k, old in before.items() if k not in measured]
+    return regressions, missing
+
+
+def int_list(value):
+    return [int(v) for v in value.split(',') if v]
+
+
+def main():
+    ap = argparse.ArgumentParser(description='Offline benchmark suite for Eya.py, Moetaz.py and CVParser')
+    ap.add_argument('--suite', nargs='+', choices=list(SUITES), default=list(SUITES))
+    ap.add_argument('--requests', type=int, default=50, help='Timed calls per eya/moetaz scenario')
+    ap.add_argument('--eya-resources', type=int_list, default=[10, 100, 1000])
+    ap.add_argument('--eya-history', type=int_list, default=[0, 100, 1000])
+    ap.add_argument('--scenario-counts', type=int_list, default=[10, 1000, 10000])
+    ap.add_argument('--scenario-requests', type=int, default=10, help='Timed calls per scenario count')
+    ap.add_argument('--moetaz-members', type=int_list, default=[5, 25, 100])
+    ap.add_argument('--cv-files', nargs='+', default=[os.path.join(ROOT, 'samples', 'C.jpg')])
+    ap.add_argument('--cv-modes', nargs='+', choices=['text', 'layout'], default=['text', 'layout'])
+    ap.add_argument('--cv-requests', type=int, default=5, help='Timed parses per CV scenario')
+    ap.add_argument('--output', help='Write the JSON report to this file as well as stdout')
+    ap.add_argument('--baseline', help='Previous JSON report to compare p50 latencies against')
+    ap.add_argument('--tolerance', type=float, default=0.2, help='Allowed p50 slowdown, as a fraction')
+    args = ap.parse_args()
+
+    # Eya.py loads its pickles relative to the working directory
+    os.chdir(ROOT)
+
+    results = []
+    for name in args.suite:
+        try:
+            results.extend(SUITES[name](args))
+        except Exception as e:
+            results.append({'suite': name, 'error': f"{type(e).__name__}: {e}"})
+
+    report = {
+        'meta': {'timestamp': datetime.now().isoformat(timespec='seconds'),
+                 'python': platform.python_version(), 'platform': platform.platform()},
+        'results': results,
+    }
+    errors = [r for r in results if 'error' in r]
+    regressions, missing = [], []
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            regressions, missing = compare(results, json.load(f), args.tolerance)
+        report['regressions'] = regressions
+        report['missing'] = missing
+
+    out = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(out + '\n')
+    print(out)
+    sys.exit(1 if errors or regressions or missing else 0)
+
+
+if __name__ == '__main__':
+    main()
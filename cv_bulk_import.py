@@ -0,0 +1,416 @@
+#!/usr/bin/env python3
+"""Bulk CV ingestion: parse a directory or manifest of CVs and update user profiles.
+
+Usage:
+    python cv_bulk_import.py --dir ./cvs --workers 8
+    python cv_bulk_import.py --manifest onboarding.jsonl --checkpoint onboarding.ckpt
+
+A manifest is either one file path per line, or JSON lines of the form
+{"path": "...", "userId": "..."}. Entries with a userId update that user;
+the others update the existing user whose email matches the one in the CV.
+
+No accounts are created: the User schema requires a password for local
+accounts, so users must exist (invited or registered) before their CVs are
+imported. CVs matching no user are checkpointed as unmatched and are picked
+up again by --retry-failed once the users exist.
+
+Like the upload route (CVParserController.parseCV), each CV updates the user's
+name, phone, bio and skills, and adds the Skill, Experience and Certification
+documents it lists. Those are upserted in batches, so a rerun adds no duplicates.
+"""
+import os
+import json
+import time
+import logging
+import argparse
+from datetime import datetime
+from multiprocessing import Pool
+from pymongo import MongoClient, UpdateOne
+from pymongo.errors import BulkWriteError
+from bson.objectid import ObjectId
+
+from cv_parser_ocr import CVParser, assign_person_entities, jsonl_metrics_sink
+
+logger = logging.getLogger('cv_bulk_import')
+
+CV_EXTENSIONS = ('.pdf', '.jpg', '.jpeg', '.png', '.tif', '.tiff', '.bmp')
+
+
+def load_entries(directory=None, manifest=None):
+    """Return the list of {'path', 'userId'} entries to ingest."""
+    entries = []
+    if directory:
+        for root, _, files in os.walk(directory):
+            for name in sorted(files):
+                if name.lower().endswith(CV_EXTENSIONS):
+                    entries.append({'path': os.path.join(root, name), 'userId': None})
+    if manifest:
+        with open(manifest, encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                if line.startswith('{'):
+                    rec = json.loads(line)
+                    entries.append({'path': rec['path'], 'userId': rec.get('userId')})
+                else:
+                    entries.append({'path': line, 'userId': None})
+    return entries
+
+
+def load_checkpoint(path, retry_failed=False):
+    """Return the set of paths already handled by a previous run."""
+    done = set()
+    if not path or not os.path.exists(path):
+        return done
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            try:
+                rec = json.loads(line)
+            except ValueError:
+                # Partially written last line of an interrupted run
+                continue
+            if retry_failed and rec.get('status') != 'ok':
+                continue
+            done.add(rec['path'])
+    return done
+
+
+_metrics_sink = None
+
+
+def _init_worker(level, metrics_file=None):
+    global _metrics_sink
+    logging.getLogger('cv_parser_ocr').setLevel(level)
+    _metrics_sink = jsonl_metrics_sink(metrics_file) if metrics_file else None
+
+
+def _parse_one(entry):
+    start = time.perf_counter()
+    try:
+        parser = CVParser(entry['path'], metrics_sink=_metrics_sink)
+        data = parser.parse()
+        return {**entry, 'data': data, 'pages': parser.pages,
+                'seconds': time.perf_counter() - start, 'error': None}
+    except Exception as e:
+        return {**entry, 'data': None, 'pages': 0,
+                'seconds': time.perf_counter() - start, 'error': str(e)}
+
+
+def _load_one(entry):
+    # OCR only; extraction runs in the parent so NER can be batched
+    start = time.perf_counter()
+    try:
+        parser = CVParser(entry['path'])
+        text = parser.load_text()
+        return {**entry, 'text': text, 'data': None, 'pages': parser.pages,
+                'seconds': time.perf_counter() - start, 'error': None}
+    except Exception as e:
+        return {**entry, 'text': '', 'data': None, 'pages': 0,
+                'seconds': time.perf_counter() - start, 'error': str(e)}
+
+
+def _extract_batch(results, ner_batch_size):
+    # Errors are kept per document, like _parse_one, so one bad CV does not
+    # discard the rest of the batch
+    parsers = [CVParser(r['path']).set_text(r.pop('text')) for r in results]
+    try:
+        assign_person_entities(parsers, ner_batch_size)
+    except Exception as e:
+        logger.warning(f"Batched NER failed, falling back to per-document NER: {e}")
+    for r, parser in zip(results, parsers):
+        try:
+            r['data'] = parser._extract_all()
+        except Exception as e:
+            r['data'], r['error'] = None, str(e)
+    return results
+
+
+def build_update(result):
+    """Translate a parse result into a (user filter, users update) pair, or None.
+
+    Raises ValueError for a malformed manifest userId.
+    """
+    data = result['data']
+    now = datetime.utcnow()
+
+    to_set = {'updatedAt': now}
+    if data['fullName']:
+        to_set['name'] = data['fullName']
+    if data['phone']:
+        to_set['phone_number'] = data['phone']
+    if data['bio']:
+        to_set['bio'] = data['bio']
+    update = {'$set': to_set}
+    if data['skills']:
+        update['$addToSet'] = {'skills': {'$each': data['skills']}}
+
+    if result['userId']:
+        if not ObjectId.is_valid(result['userId']):
+            raise ValueError(f"invalid userId {result['userId']!r}")
+        return {'_id': ObjectId(result['userId'])}, update
+
+    email = data['email'].strip().lower()
+    if not email:
+        return None
+    # Existing accounts only, see the module docstring
+    return {'email': email}, update
+
+
+def _parse_date(value, formats, default):
+    for fmt in formats:
+        try:
+            return datetime.strptime(value, fmt)
+        except (TypeError, ValueError):
+            continue
+    return default
+
+
+def build_profile_ops(data, user_id):
+    """Upserts creating the Skill, Experience and Certification documents of a CV.
+
+    Mirrors CVParserController.parseCV: same duplicate keys (a document is only
+    inserted when none exists for that user and key) and the same defaults.
+    Returns {collection name: [UpdateOne]}.
+    """
+    now = datetime.utcnow()
+    stamps = {'createdAt': now, 'updatedAt': now}
+    ops = {'skills': [], 'experiences': [], 'certifications': []}
+    for name in data['skills']:
+        ops['skills'].append(UpdateOne({'userId': user_id, 'name': name}, {'$setOnInsert': {
+            'category': 'Technical', 'description': f"Extracted from CV: {name}", 'tags': 75, **stamps,
+        }}, upsert=True))
+    for exp in data['experiences']:
+        end = _parse_date(exp.get('endDate'), ['%Y-%m-%d'], None)
+        ops['experiences'].append(UpdateOne(
+            {'userId': user_id, 'job_title': exp['title'], 'company': exp['company']}, {'$setOnInsert': {
+                'employment_type': exp.get('type') or 'Temps plein',
+                'start_date': _parse_date(exp.get('startDate'), ['%Y-%m-%d'], now),
+                'end_date': end,
+                'is_current': end is None,
+                'location': exp.get('location') or '',
+                'description': exp.get('description') or '',
+                'location_type': exp.get('locationType') or 'Sur place',
+                **stamps,
+            }}, upsert=True))
+    for cert in data['certifications']:
+        # Certification has no userId in its schema; it is kept here as the duplicate key
+        ops['certifications'].append(UpdateOne(
+            {'userId': user_id, 'certifications_name': cert['name']}, {'$setOnInsert': {
+                'issued_by': cert.get('issuer') or '',
+                'obtained_date': _parse_date(cert.get('date'), ['%Y', '%b %Y', '%B %Y'], now),
+                'description': cert.get('description') or '',
+                'image': '',
+                **stamps,
+            }}, upsert=True))
+    return ops
+
+
+class BulkImporter:
+    def __init__(self, db, checkpoint_path=None, batch_size=200, report_every=50):
+        self.db = db
+        self.users = db['users'] if db is not None else None
+        # A dry run (no database) writes nothing, not even the checkpoint, so
+        # the real run that follows still imports every file
+        self.checkpoint_path = checkpoint_path if db is not None else None
+        self.batch_size = batch_size
+        self.report_every = report_every
+        # (checkpoint record, user filter, update, parsed data) waiting for the next flush
+        self.queued = []
+        self.pending = []
+        self.stats = {'files': 0, 'pages': 0, 'ok': 0, 'failed': 0, 'skipped': 0,
+                      'matched': 0, 'unmatched': 0, 'modified': 0,
+                      'skills_added': 0, 'experiences_added': 0, 'certifications_added': 0,
+                      'parse_seconds': 0.0}
+        self.started = time.perf_counter()
+
+    def add(self, result):
+        self.stats['files'] += 1
+        self.stats['pages'] += result['pages']
+        self.stats['parse_seconds'] += result['seconds']
+
+        op = None
+        error = result['error']
+        if error:
+            logger.warning(f"Failed to parse {result['path']}: {error}")
+        else:
+            try:
+                op = build_update(result)
+            except ValueError as e:
+                error = str(e)
+                logger.warning(f"Bad manifest entry {result['path']}: {error}")
+        if error:
+            status = 'error'
+        elif op is None:
+            status = 'skipped'
+            logger.warning(f"No email or userId for {result['path']}, skipping")
+        else:
+            status = 'ok'
+        self.stats['failed' if status == 'error' else status] += 1
+        rec = {'path': result['path'], 'status': status, 'pages': result['pages'], 'error': error}
+        self.pending.append(rec)
+        if op is not None:
+            self.queued.append((rec, *op, result['data']))
+
+        if len(self.queued) >= self.batch_size:
+            self.flush()
+        if self.stats['files'] % self.report_every == 0:
+            logger.info(self.throughput_line())
+
+    def resolve(self):
+        """User _id for each queued filter, or None, with one $in query per filter key"""
+        ids = [q[1]['_id'] for q in self.queued if '_id' in q[1]]
+        emails = [q[1]['email'] for q in self.queued if 'email' in q[1]]
+        found, by_email = set(), {}
+        if ids:
+            found = {u['_id'] for u in self.users.find({'_id': {'$in': ids}}, {'_id': 1})}
+        if emails:
+            by_email = {u['email']: u['_id'] for u in self.users.find({'email': {'$in': emails}}, {'email': 1})}
+        return [q[1]['_id'] if q[1].get('_id') in found else by_email.get(q[1].get('email'))
+                for q in self.queued]
+
+    def flush(self):
+        # Checkpoint only after the batch is durable so a resumed run redoes it
+        if self.queued and self.users is not None:
+            # Per collection: ops, and the checkpoint record of each op so write
+            # errors can be attributed to a file
+            batches = {}
+            for (rec, _, update, data), user_id in zip(self.queued, self.resolve()):
+                if user_id is None:
+                    rec['status'] = 'unmatched'
+                    self.stats['ok'] -= 1
+                    self.stats['unmatched'] += 1
+                    logger.warning(f"No user matches {rec['path']}")
+                    continue
+                profile = build_profile_ops(data, user_id)
+                for name, ops in [('users', [UpdateOne({'_id': user_id}, update)]), *profile.items()]:
+                    batch = batches.setdefault(name, ([], []))
+                    batch[0].extend(ops)
+                    batch[1].extend([rec] * len(ops))
+            for name, (ops, op_records) in batches.items():
+                if ops:
+                    self.write(name, ops, op_records)
+        self.queued = []
+        if self.checkpoint_path and self.pending:
+            with open(self.checkpoint_path, 'a', encoding='utf-8') as f:
+                for rec in self.pending:
+                    f.write(json.dumps(rec) + '\n')
+                f.flush()
+                os.fsync(f.fileno())
+        self.pending = []
+
+    def write(self, name, ops, op_records):
+        try:
+            res = self.db[name].bulk_write(ops, ordered=False)
+            counts = {'nMatched': res.matched_count, 'nModified': res.modified_count,
+                      'nUpserted': res.upserted_count}
+            errors = []
+        except BulkWriteError as e:
+            # Unordered: the other ops were applied, only writeErrors failed
+            counts = e.details
+            errors = e.details.get('writeErrors', [])
+        if name == 'users':
+            self.stats['matched'] += counts.get('nMatched', 0)
+            # Users deleted since resolve()
+            self.stats['unmatched'] += len(ops) - len(errors) - counts.get('nMatched', 0)
+            self.stats['modified'] += counts.get('nModified', 0)
+        else:
+            self.stats[f'{name}_added'] += counts.get('nUpserted', 0)
+        for err in errors:
+            rec = op_records[err['index']]
+            if rec['status'] != 'error':
+                self.stats['ok'] -= 1
+                self.stats['failed'] += 1
+            rec['status'], rec['error'] = 'error', err.get('errmsg', 'write error')
+            logger.warning(f"Write to {name} failed for {rec['path']}: {rec['error']}")
+
+    def throughput(self):
+        elapsed = time.perf_counter() - self.started
+        return {
+            'elapsed_s': round(elapsed, 2),
+            'files_per_s': round(self.stats['files'] / elapsed, 3) if elapsed else 0.0,
+            'pages_per_s': round(self.stats['pages'] / elapsed, 3) if elapsed else 0.0,
+        }
+
+    def throughput_line(self):
+        t = self.throughput()
+        return (f"{self.stats['files']} files, {self.stats['pages']} pages in {t['elapsed_s']}s "
+                f"({t['files_per_s']} files/s, {t['pages_per_s']} pages/s)")
+
+    def summary(self):
+        return {**self.stats, 'parse_seconds': round(self.stats['parse_seconds'], 2),
+                **self.throughput()}
+
+
+def run(entries, importer, workers, log_level=logging.WARNING, metrics_file=None, ner_batch=0):
+    """Parse entries in a process pool and feed the importer.
+
+    With ner_batch > 0 workers only OCR, and the parent extracts fields for
+    ner_batch documents at a time so spaCy NER goes through nlp.pipe.
+    """
+    task = _load_one if ner_batch else _parse_one
+    if ner_batch:
+        logging.getLogger('cv_parser_ocr').setLevel(log_level)
+    loaded = []
+    with Pool(workers, initializer=_init_worker, initargs=(log_level, metrics_file)) as pool:
+        try:
+            for result in pool.imap_unordered(task, entries, chunksize=1):
+                if not ner_batch or result['error']:
+                    importer.add(result)
+                    continue
+                loaded.append(result)
+                if len(loaded) >= ner_batch:
+                    for r in _extract_batch(loaded, ner_batch):
+                        importer.add(r)
+                    loaded = []
+            for r in _extract_batch(loaded, ner_batch) if loaded else []:
+                importer.add(r)
+        finally:
+            importer.flush()
+    return importer.summary()
+
+
+if __name__ == '__main__':
+    ap = argparse.ArgumentParser(description='Bulk-import CVs into user profiles')
+    ap.add_argument('--dir', help='Directory scanned recursively for CV files')
+    ap.add_argument('--manifest', help='File listing CV paths (plain or JSON lines)')
+    ap.add_argument('--checkpoint', default='cv_bulk_import.ckpt',
+                    help='Progress file used to resume an interrupted run')
+    ap.add_argument('--retry-failed', action='store_true',
+                    help='Reprocess files that failed or matched no user previously')
+    ap.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    ap.add_argument('--batch-size', type=int, default=200, help='Updates per bulk_write')
+    ap.add_argument('--report-every', type=int, default=50, help='Log throughput every N files')
+    ap.add_argument('--mongo-uri', default=os.getenv('MONGO_URI', 'mongodb://localhost:27017/'))
+    ap.add_argument('--db', default='ProjectManagement')
+    ap.add_argument('--dry-run', action='store_true', help='Parse only, do not write to MongoDB or the checkpoint')
+    ap.add_argument('--metrics-file', help='Append per-file stage timings (JSON lines) to this file')
+    ap.add_argument('--ner-batch', type=int, default=0,
+                    help='Extract fields in the parent, N CVs at a time, with batched NER-only spaCy')
+    ap.add_argument('--verbose', action='store_true', help='Keep per-file parser logs')
+    args = ap.parse_args()
+
+    if not args.dir and not args.manifest:
+        ap.error('one of --dir or --manifest is required')
+    if args.ner_batch and args.metrics_file:
+        ap.error('--metrics-file is not supported with --ner-batch')
+
+    entries = load_entries(args.dir, args.manifest)
+    done = load_checkpoint(args.checkpoint, args.retry_failed)
+    todo = [e for e in entries if e['path'] not in done]
+    logger.info(f"{len(entries)} CVs found, {len(entries) - len(todo)} already done, {len(todo)} to process")
+
+    db = None
+    if not args.dry_run:
+        db = MongoClient(args.mongo_uri)[args.db]
+
+    importer = BulkImporter(db, args.checkpoint, args.batch_size, args.report_every)
+    try:
+        summary = run(todo, importer, args.workers,
+                      logging.INFO if args.verbose else logging.WARNING, args.metrics_file, args.ner_batch)
+    except KeyboardInterrupt:
+        if importer.checkpoint_path:
+            logger.warning(f"Interrupted; progress saved to {importer.checkpoint_path}")
+        summary = importer.summary()
+    logger.info(importer.throughput_line())
+    print(json.dumps(summary, indent=2))
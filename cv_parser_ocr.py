@@ -3,12 +3,16 @@ import sys
 import os
 import re
 import json
+import time
 import tempfile
 import logging
+import tracemalloc
+from contextlib import contextmanager, nullcontext
 from datetime import datetime
 from pdf2image import convert_from_path
 from pdf2image.exceptions import PDFInfoNotInstalledError
 import pytesseract
+from PIL import Image
 
 # Optional PDF fallback
 try:
@@ -25,6 +29,13 @@ try:
 except Exception:
     HAS_SPACY = False
 
+# Optional peak RSS for timing reports (not available on Windows)
+try:
+    import resource
+    HAS_RESOURCE = True
+except ImportError:
+    HAS_RESOURCE = False
+
 # Configure Tesseract
 pytesseract.pytesseract.tesseract_cmd = os.getenv(
     'TESSERACT_CMD',
@@ -34,8 +45,8 @@ pytesseract.pytesseract.tesseract_cmd = os.getenv(
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger('cv_parser_ocr')
 
-EMAIL_RE = r'[\w._%+-]+@[\w.-]+\.[A-Za-z]{2,}'
-PHONE_RE = r'\+\d{1,3}(?:[ \-.\(\)]*\d+){2,}'
+EMAIL_RE = re.compile(r'[\w._%+-]+@[\w.-]+\.[A-Za-z]{2,}')
+PHONE_RE = re.compile(r'\+\d{1,3}(?:[ \-.\(\)]*\d+){2,}')
 
 SECTION_HEADERS = {
     'header':       [],
@@ -50,12 +61,276 @@ SECTION_HEADERS = {
     'certifications': ['certifications', 'certificates', 'accreditations']
 }
 
+# One alternation over every header, grouped by section in SECTION_HEADERS order,
+# so the first matching group is the section the old per-section loop would pick.
+HEADER_RE = re.compile('|'.join(
+    f"(?P<{sec}>{'|'.join(re.escape(h) for h in heads)})"
+    for sec, heads in SECTION_HEADERS.items() if heads
+))
+
+BULLET_RE = re.compile(r'^[\u2022\-\*\•]\s*')
+NAME_SPLIT_RE = re.compile(r'[._]')
+ALPHA_NAME_RE = re.compile(r'[A-Za-z ]+')
+HEADER_NOISE_RE = re.compile(r'linkedin|@|\+|\d', re.I)
+TITLE_NAME_RE = re.compile(r'[A-Z][a-z]+(?:\s+[A-Z][a-z]+)+')
+NON_ALPHA_RE = re.compile(r'[^A-Za-z\s]')
+YEAR_RANGE_RE = re.compile(r'\d{4}[-–]\d{4}')
+NON_PHONE_RE = re.compile(r'[^\d+]')
+DATE_RANGE_RE = re.compile(r'(\d{4}|\w+\s*\d{4})\s*[-–]\s*(Present|\d{4})')
+CERT_DATE_RE = re.compile(r'(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+\d{4}|\d{4}')
+
+# Only the start of the CV is sent to spaCy, where the name usually is
+NER_CHARS = 1000
+
+
+def _ner_only_pipes():
+    """Pipeline components needed for NER; tok2vec is kept only if ner listens to it"""
+    keep = ['ner']
+    if 'tok2vec' in nlp.pipe_names and 'ner' in nlp.get_pipe('tok2vec').listening_components:
+        keep.insert(0, 'tok2vec')
+    return keep
+
+
+def batch_person_entities(texts, batch_size=64, n_process=1):
+    """Return the PERSON entity texts of each text, running only spaCy's NER through nlp.pipe"""
+    if not HAS_SPACY:
+        return [[] for _ in texts]
+    with nlp.select_pipes(enable=_ner_only_pipes()):
+        docs = nlp.pipe((t[:NER_CHARS] for t in texts), batch_size=batch_size, n_process=n_process)
+        return [[e.text for e in doc.ents if e.label_ == 'PERSON'] for doc in docs]
+
+class StageTimer:
+    """Records wall time, CPU time and memory per parsing stage.
+
+    peak_mem_kb comes from tracemalloc and only sees Python allocations: PIL
+    image buffers and the Tesseract/poppler child processes are invisible to
+    it, so it undercounts rasterize and ocr. Where the resource module exists
+    each stage also reports max_rss_kb (process peak RSS so far) and
+    child_max_rss_kb (largest finished child process, i.e. tesseract or
+    pdftoppm). ru_maxrss is in KB on Linux but in bytes on macOS.
+    """
+
+    def __init__(self):
+        self.stages = {}
+        self.pages = []
+        self._peak = 0
+        self._start = time.perf_counter()
+        self._owns_tracing = False
+
+    def start(self):
+        self._start = time.perf_counter()
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._owns_tracing = True
+
+    def stop(self):
+        if self._owns_tracing:
+            tracemalloc.stop()
+            self._owns_tracing = False
+
+    @contextmanager
+    def stage(self, name, page=None):
+        # Stages must not nest: each one resets the tracemalloc peak
+        tracemalloc.reset_peak()
+        mem0, _ = tracemalloc.get_traced_memory()
+        wall0, cpu0, os0 = time.perf_counter(), time.process_time(), os.times()
+        try:
+            yield
+        finally:
+            os1 = os.times()
+            _, peak = tracemalloc.get_traced_memory()
+            self._peak = max(self._peak, peak)
+            rec = {
+                'wall_s': time.perf_counter() - wall0,
+                'cpu_s': time.process_time() - cpu0,
+                # Tesseract and poppler run as child processes
+                'child_cpu_s': (os1.children_user + os1.children_system)
+                               - (os0.children_user + os0.children_system),
+                'peak_mem_kb': (peak - mem0) / 1024,
+            }
+            if HAS_RESOURCE:
+                rec['max_rss_kb'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+                rec['child_max_rss_kb'] = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+            agg = self.stages.setdefault(name, {'calls': 0, 'wall_s': 0.0, 'cpu_s': 0.0,
+                                                'child_cpu_s': 0.0, 'peak_mem_kb': 0.0})
+            agg['calls'] += 1
+            for k in ('wall_s', 'cpu_s', 'child_cpu_s'):
+                agg[k] += rec[k]
+            agg['peak_mem_kb'] = max(agg['peak_mem_kb'], rec['peak_mem_kb'])
+            for k in ('max_rss_kb', 'child_max_rss_kb'):
+                if k in rec:
+                    agg[k] = max(agg.get(k, 0), rec[k])
+            if page is not None:
+                self.pages.append({'page': page, 'stage': name, **rec})
+
+    def report(self):
+        rnd = lambda d: {k: round(v, 4) if isinstance(v, float) else v for k, v in d.items()}
+        out = {
+            'total_s': round(time.perf_counter() - self._start, 4),
+            'peak_mem_kb': round(self._peak / 1024, 1),
+            'stages': {k: rnd(v) for k, v in self.stages.items()},
+            'pages': [rnd(p) for p in self.pages],
+        }
+        if HAS_RESOURCE:
+            out['max_rss_kb'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return out
+
+
+# Layout OCR mode: pixels darker than INK_THRESHOLD count as content, blocks
+# whose mean word confidence is below MIN_BLOCK_CONF are treated as pictures.
+# Pictures are still OCRed; only their output is dropped afterwards.
+INK_THRESHOLD = 200
+CROP_MARGIN = 10
+MIN_BLOCK_CONF = 30
+COLUMN_BINS = 100
+
+
+def content_bbox(img, threshold=INK_THRESHOLD, margin=CROP_MARGIN):
+    """Bounding box of the non-blank part of a page image, or None if it is blank"""
+    mask = img.convert('L').point([255 if i < threshold else 0 for i in range(256)])
+    box = mask.getbbox()
+    if not box:
+        return None
+    left, top, right, bottom = box
+    return (max(0, left - margin), max(0, top - margin),
+            min(img.width, right + margin), min(img.height, bottom + margin))
+
+
+def layout_lines(data, min_block_conf=MIN_BLOCK_CONF):
+    """Group Tesseract image_to_data words into lines, dropping low-confidence blocks.
+
+    This filters image regions (photos, logos, icons) after OCR has already run
+    on them; it removes their garbage text but saves no Tesseract time.
+    """
+    lines, block_confs = {}, {}
+    for i, word in enumerate(data['text']):
+        conf = float(data['conf'][i])
+        if conf < 0 or not word.strip():
+            continue
+        block = data['block_num'][i]
+        key = (block, data['par_num'][i], data['line_num'][i])
+        left, top = data['left'][i], data['top'][i]
+        right, bottom = left + data['width'][i], top + data['height'][i]
+        line = lines.setdefault(key, {'words': [], 'left': left, 'top': top, 'right': right, 'bottom': bottom})
+        line['words'].append(word)
+        line['left'], line['top'] = min(line['left'], left), min(line['top'], top)
+        line['right'], line['bottom'] = max(line['right'], right), max(line['bottom'], bottom)
+        block_confs.setdefault(block, []).append(conf)
+
+    keep = {b for b, c in block_confs.items() if sum(c) / len(c) >= min_block_conf}
+    return [{'text': ' '.join(L['words']), 'left': L['left'], 'top': L['top'],
+             'right': L['right'], 'bottom': L['bottom']}
+            for key, L in lines.items() if key[0] in keep]
+
+
+def same_row(a, b):
+    """True when two lines overlap vertically by more than half the shorter one"""
+    overlap = min(a['bottom'], b['bottom']) - max(a['top'], b['top'])
+    return overlap > 0.5 * min(a['bottom'] - a['top'], b['bottom'] - b['top'])
+
+
+def find_gutter(lines, width, bins=COLUMN_BINS):
+    """x position of the gap between two text columns, or None for a single column"""
+    if not lines or width <= 0:
+        return None
+    cover = [0] * bins
+    for L in lines:
+        # Full-width lines (name, section banners) would hide the gutter
+        if L['right'] - L['left'] > 0.6 * width:
+            continue
+        for b in range(int(L['left'] * bins / width), min(bins, int((L['right'] - 1) * bins / width) + 1)):
+            cover[b] += 1
+
+    best, run_start = None, None
+    for b in range(int(bins * 0.2), int(bins * 0.8) + 1):
+        if b < int(bins * 0.8) and cover[b] == 0:
+            run_start = b if run_start is None else run_start
+            continue
+        if run_start is not None and (best is None or b - run_start > best[1] - best[0]):
+            best = (run_start, b)
+        run_start = None
+    if not best:
+        return None
+
+    gutter = (best[0] + best[1]) / 2 * width / bins
+    left = [L for L in lines if L['right'] <= gutter]
+    right = [L for L in lines if L['left'] >= gutter]
+    if len(left) < 3 or len(right) < 3:
+        return None
+    # A real right column is left-aligned; right-aligned dates next to job
+    # titles in a single-column CV start at scattered x positions instead.
+    right_lefts = sorted(L['left'] for L in right)
+    median = right_lefts[len(right_lefts) // 2]
+    aligned = sum(1 for x in right_lefts if abs(x - median) <= 0.03 * width)
+    if aligned < len(right) / 2:
+        return None
+    # Dates in a single format do line up, but each one is short and sits on
+    # the row of a left line (its job title); a real column is mostly full lines.
+    appended = sum(1 for R in right
+                   if R['right'] - R['left'] < 0.5 * (width - gutter) and any(same_row(R, L) for L in left))
+    return gutter if appended <= len(right) / 2 else None
+
+
+def order_lines(lines, gutter):
+    """Reading order: top to bottom, left column before right between full-width lines"""
+    lines = sorted(lines, key=lambda L: (L['top'], L['left']))
+    if gutter is None:
+        return [L['text'] for L in lines]
+    out, left, right = [], [], []
+    for L in lines:
+        if L['right'] <= gutter:
+            left.append(L['text'])
+        elif L['left'] >= gutter:
+            right.append(L['text'])
+        else:
+            out += left + right + [L['text']]
+            left, right = [], []
+    return out + left + right
+
+
+def layout_text(img):
+    """OCR a page in one image_to_data pass, cropped to its content and read column by column.
+
+    Returns (text, columns); columns is 0 when the page is blank and OCR is skipped.
+    The only OCR work saved is on blank pages and the cropped margins: photos and
+    other image regions inside the content box still go through Tesseract and are
+    filtered afterwards by layout_lines. Masking them out before OCR by ink density
+    would also blank light text on dark sidebars, which many CV templates use.
+    """
+    box = content_bbox(img)
+    if box is None:
+        return "", 0
+    page = img.crop(box)
+    data = pytesseract.image_to_data(page, output_type=pytesseract.Output.DICT)
+    lines = layout_lines(data)
+    gutter = find_gutter(lines, page.width)
+    return "\n".join(order_lines(lines, gutter)), (1 if gutter is None else 2)
+
+
 class CVParser:
-    def __init__(self, path):
+    def __init__(self, path, timings=False, metrics_sink=None, ocr_mode=None):
         self.path = path
+        # 'text' is plain image_to_string; 'layout' uses layout_text()
+        self.ocr_mode = ocr_mode or os.getenv('CV_PARSER_OCR_MODE', 'text')
+        # Timing is opt-in: tracemalloc slows down the pure-Python stages.
+        # The timer only exists (and traces) while parse()/parse_text() runs.
+        self.timer = None
+        self.timings = timings
+        self.metrics_sink = metrics_sink
         self.text = ""
+        # 'ocr' or 'fallback' once load_text() ran, so callers can tell OCR failures apart
+        self.text_source = None
         self.lines = []
+        self.pages = 0
         self.sections = {}
+        self.bodies = {}
+        self._email = None
+        self._phones = []
+        # Text _email/_phones were found in, so assign_person_entities and
+        # _extract_all don't both scan it
+        self._scanned = None
+        # PERSON entities from a batched NER run; None means run spaCy per document
+        self._person_ents = None
         self.data = {
             'fullName': '', 'email': '', 'phone': '',
             'bio': '', 'skills': [], 'languages': [],
@@ -63,46 +338,121 @@ class CVParser:
         }
 
     def parse(self):
+        with self._timed():
+            self.load_text()
+            return self._extract_all()
+
+    def load_text(self):
+        """OCR the file, falling back to embedded text, without running the extractors"""
         self._ocr_text()
         if not self.text.strip():
-            self._fallback_text()
-        self._segment()
+            with self._stage('fallback'):
+                self._fallback_text()
+        return self.text
+
+    def parse_text(self, text):
+        """Run the extractors on already extracted text, skipping OCR"""
+        with self._timed():
+            self.set_text(text)
+            return self._extract_all()
+
+    def set_text(self, text):
+        self.text = text
+        self.lines = [L.strip() for L in text.splitlines() if L.strip()]
+        return self
+
+    def _extract_all(self):
+        with self._stage('segment'):
+            self._scan_text()
+            self._segment()
+        # NER inside _extract_name is timed as its own stage
         self._extract_name()
-        self._extract_contact()
-        self._extract_skills()
-        self._extract_languages()
-        self._extract_experiences()
-        self._extract_bio()
-        self._extract_certifications()
-        
-        # Post-process to fix validation issues
-        self._fix_validation_issues()
-        
+        with self._stage('extract'):
+            self._extract_contact()
+            self._extract_skills()
+            self._extract_languages()
+            self._extract_experiences()
+            self._extract_bio()
+            self._extract_certifications()
+
+            # Post-process to fix validation issues
+            self._fix_validation_issues()
+
+        if self.timer:
+            report = self.timer.report()
+            report['file'] = self.path
+            report['page_count'] = self.pages
+            if self.timings:
+                self.data['_timings'] = report
+            if self.metrics_sink:
+                self.metrics_sink(report)
         return self.data
 
+    @contextmanager
+    def _timed(self):
+        if not (self.timings or self.metrics_sink) or self.timer:
+            yield
+            return
+        self.timer = StageTimer()
+        self.timer.start()
+        try:
+            yield
+        finally:
+            # Always stop tracing, even if parsing raised
+            self.timer.stop()
+            self.timer = None
+
+    def _stage(self, name, page=None):
+        return self.timer.stage(name, page) if self.timer else nullcontext()
+
     def _ocr_text(self):
         try:
             if self.path.lower().endswith('.pdf'):
                 pop = os.getenv('POPPLER_PATH') or os.getenv('pdf')
-                imgs = convert_from_path(self.path, dpi=300,
-                    poppler_path=pop if pop and os.path.isdir(pop) else None)
-                self.text = "\n".join(pytesseract.image_to_string(i) for i in imgs)
+                with self._stage('rasterize'):
+                    imgs = convert_from_path(self.path, dpi=300,
+                        poppler_path=pop if pop and os.path.isdir(pop) else None)
+                self.pages = len(imgs)
+                texts = []
+                for n, img in enumerate(imgs, start=1):
+                    with self._stage('ocr', page=n):
+                        texts.append(self._ocr_image(img, n))
+                self.text = "\n".join(texts)
                 logger.info("OCR extracted text successfully")
             else:
-                self.text = pytesseract.image_to_string(self.path)
+                self.pages = 1
+                with self._stage('ocr', page=1):
+                    if self.ocr_mode == 'layout':
+                        with Image.open(self.path) as img:
+                            self.text = self._ocr_image(img, 1)
+                    else:
+                        self.text = pytesseract.image_to_string(self.path)
                 logger.info("OCR extracted text successfully")
         except PDFInfoNotInstalledError:
             logger.warning("Poppler not found; OCR may be incomplete")
         except Exception as e:
             logger.warning(f"OCR error: {e}")
+        if self.text.strip():
+            self.text_source = 'ocr'
         self.lines = [L.strip() for L in self.text.splitlines() if L.strip()]
         logger.info(f"Processed text into {len(self.lines)} lines")
 
+    def _ocr_image(self, img, page):
+        if self.ocr_mode != 'layout':
+            return pytesseract.image_to_string(img)
+        text, columns = layout_text(img)
+        if columns:
+            logger.info(f"Page {page}: {columns} column(s) detected")
+        else:
+            logger.info(f"Page {page}: blank, OCR skipped")
+        return text
+
     def _fallback_text(self):
         raw = ""
         if HAS_PYPDF2 and self.path.lower().endswith('.pdf'):
             try:
                 r = PyPDF2.PdfReader(self.path)
+                self.pages = len(r.pages)
                 raw = "\n".join(p.extract_text() or "" for p in r.pages)
             except:
                 raw = ""
@@ -112,41 +462,66 @@ class CVParser:
             except:
                 raw = ""
         self.text = raw
+        self.text_source = 'fallback'
         self.lines = [L.strip() for L in raw.splitlines() if L.strip()]
         logger.info(f"Used fallback text extraction, found {len(self.lines)} lines")
 
+    def _scan_text(self):
+        """Search the full text once for the patterns several extractors share"""
+        if self._scanned is self.text:
+            return
+        self._scanned = self.text
+        self._email = EMAIL_RE.search(self.text)
+        self._phones = PHONE_RE.findall(self.text)
+
     def _segment(self):
+        # Single pass: each line is routed to its section, and non-header lines
+        # also go to self.bodies so extractors never re-test header prefixes.
         cur = 'header'
         self.sections = {cur: []}
+        self.bodies = {cur: []}
         for L in self.lines:
-            low = L.lower()
-            for sec, heads in SECTION_HEADERS.items():
-                if any(low.startswith(h) for h in heads):
-                    cur = sec
-                    self.sections.setdefault(cur, [])
-                    logger.info(f"Detected section: {sec} from line: {L}")
-                    break
+            m = HEADER_RE.match(L.lower())
+            if m:
+                cur = m.lastgroup
+                self.sections.setdefault(cur, []).append(L)
+                self.bodies.setdefault(cur, [])
+                logger.info(f"Detected section: {cur} from line: {L}")
+                continue
             self.sections.setdefault(cur, []).append(L)
+            self.bodies.setdefault(cur, []).append(L)
         logger.info(f"Extracted text length: {len(self.text)}")
 
-    def _extract_name(self):
-        # 1) email-based
-        m = re.search(EMAIL_RE, self.text)
+    def _name_from_email(self):
+        m = self._email
         if m:
             user = m.group(0).split('@')[0]
-            parts = re.split(r'[._]', user)
+            parts = NAME_SPLIT_RE.split(user)
             name = " ".join(p.title() for p in parts if p)
             if len(name.split())>=2:
-                self.data['fullName'] = name
-                logger.info(f"Extracted name from email: {name}")
-                return
+                return name
+        return ""
+
+    def _person_entities(self):
+        if self._person_ents is not None:
+            return self._person_ents
+        with self._stage('ner'):
+            doc = nlp(self.text[:NER_CHARS])  # Limit to the start of the CV for performance
+        return [ent.text for ent in doc.ents if ent.label_=='PERSON']
+
+    def _extract_name(self):
+        # 1) email-based
+        name = self._name_from_email()
+        if name:
+            self.data['fullName'] = name
+            logger.info(f"Extracted name from email: {name}")
+            return
 
         # 2) spaCy NER
         if HAS_SPACY:
-            doc = nlp(self.text[:1000])  # Limit to first 1000 chars for performance
-            for ent in doc.ents:
-                if ent.label_=='PERSON' and re.fullmatch(r'[A-Za-z ]+', ent.text):
-                    cand = ent.text.strip()
+            for ent in self._person_entities():
+                if ALPHA_NAME_RE.fullmatch(ent):
+                    cand = ent.strip()
                     if len(cand.split())>=2:
                         self.data['fullName'] = cand
                         logger.info(f"Extracted name using NER: {cand}")
@@ -154,15 +529,15 @@ class CVParser:
 
         # 3) Title-case header lines
         for L in self.sections.get('header',[]):
-            if re.search(r'linkedin|@|\+|\d', L, re.I): continue
-            if re.fullmatch(r'[A-Z][a-z]+(?:\s+[A-Z][a-z]+)+', L.strip()):
+            if HEADER_NOISE_RE.search(L): continue
+            if TITLE_NAME_RE.fullmatch(L.strip()):
                 self.data['fullName'] = L.strip()
                 logger.info(f"Extracted name from header: {L.strip()}")
                 return
 
         # 4) scan header lines for >=2 alpha-words
         for L in self.sections.get('header',[]):
-            clean = re.sub(r'[^A-Za-z\s]','',L).strip()
+            clean = NON_ALPHA_RE.sub('',L).strip()
             if len(clean.split())>=2:
                 self.data['fullName'] = clean.title()
                 logger.info(f"Extracted name from header words: {clean.title()}")
@@ -171,31 +546,28 @@ class CVParser:
         logger.info(f"Extracted name: {self.data['fullName']}")
 
     def _extract_contact(self):
-        em = re.search(EMAIL_RE, self.text)
+        em = self._email
         self.data['email'] = em.group(0) if em else ""
-        phones = re.findall(PHONE_RE, self.text)
         phone = ""
-        for p in phones:
-            if not re.fullmatch(r'\d{4}[-–]\d{4}', p):
-                phone = re.sub(r'[^\d+]', '', p)
+        for p in self._phones:
+            if not YEAR_RANGE_RE.fullmatch(p):
+                phone = NON_PHONE_RE.sub('', p)
                 break
         self.data['phone'] = phone
         logger.info(f"Extracted email: {self.data['email']} and phone: {self.data['phone']}")
 
     def _extract_skills(self):
         out=[]
-        for L in self.sections.get('skills',[]):
-            if any(L.lower().startswith(h) for h in SECTION_HEADERS['skills']): continue
-            t = re.sub(r'^[\u2022\-\*\•]\s*','',L).strip()
+        for L in self.bodies.get('skills',[]):
+            t = BULLET_RE.sub('',L).strip()
             if t: out.append(t)
         self.data['skills'] = out
         logger.info(f"Extracted {len(self.data['skills'])} skills: {self.data['skills']}")
 
     def _extract_languages(self):
         out=[]
-        for L in self.sections.get('languages',[]):
-            if any(L.lower().startswith(h) for h in SECTION_HEADERS['languages']): continue
-            t = re.sub(r'^[\u2022\-\*\•]\s*','',L).strip()
+        for L in self.bodies.get('languages',[]):
+            t = BULLET_RE.sub('',L).strip()
             if t: out.append(t)
         self.data['languages'] = out
         logger.info(f"Extracted {len(self.data['languages'])} languages: {self.data['languages']}")
@@ -205,11 +577,10 @@ class CVParser:
         exp=[]
         # block by date-containing or header lines
         i=0
-        date_re = re.compile(r'(\d{4}|\w+\s*\d{4})\s*[-–]\s*(Present|\d{4})')
         while i < len(seq):
             L = seq[i]
             # if line contains a date, treat as header+date on same line
-            dm = date_re.search(L)
+            dm = DATE_RANGE_RE.search(L)
             if dm:
                 start, end = dm.group(1), dm.group(2)
                 header_part = L[:dm.start()].strip()
@@ -253,7 +624,7 @@ class CVParser:
                 continue
             # else if next line has a date
             if i+1<len(seq):
-                dm2 = date_re.search(seq[i+1])
+                dm2 = DATE_RANGE_RE.search(seq[i+1])
                 if dm2:
                     title = L
                     start,end = dm2.group(1), dm2.group(2)
@@ -293,24 +664,16 @@ class CVParser:
         logger.info(f"Extracted {len(exp)} experiences")
 
     def _extract_bio(self):
-        lines = self.sections.get('summary',[])
-        bio = []
-        for L in lines:
-            if any(L.lower().startswith(h) for h in SECTION_HEADERS['summary']): continue
-            bio.append(L)
-        self.data['bio'] = ' '.join(bio).strip()
+        self.data['bio'] = ' '.join(self.bodies.get('summary',[])).strip()
         logger.info(f"Extracted bio: {self.data['bio'][:50]}...")
         
     def _extract_certifications(self):
         """Extract certifications from CV"""
         certifications = []
         
-        if "certifications" in self.sections:
-            cert_lines = self.sections["certifications"]
+        if "certifications" in self.bodies:
+            cert_lines = self.bodies["certifications"]
             for line in cert_lines:
-                if any(line.lower().startswith(h) for h in SECTION_HEADERS['certifications']):
-                    continue
-                    
                 if len(line.strip()) < 3:
                     continue
                 
@@ -324,7 +687,7 @@ class CVParser:
                     issuer = "Certification Authority"
                 
                 # Look for dates
-                date_match = re.search(r'(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+\d{4}|\d{4}', line)
+                date_match = CERT_DATE_RE.search(line)
                 cert_date = date_match.group(0) if date_match else ""
                 
                 certifications.append({
@@ -369,15 +732,53 @@ class CVParser:
         logger.info("Fixed validation issues in extracted data")
 
 
+def assign_person_entities(parsers, batch_size=64, n_process=1):
+    """Run batched NER for parsers whose text is already loaded.
+
+    Only documents whose name cannot be taken from the email go through spaCy;
+    parsers left unassigned fall back to per-document NER in _extract_name.
+    """
+    for p in parsers:
+        p._scan_text()
+    need_ner = [p for p in parsers if not p._name_from_email()]
+    if HAS_SPACY and need_ner:
+        ents = batch_person_entities([p.text for p in need_ner], batch_size, n_process)
+        for p, e in zip(need_ner, ents):
+            p._person_ents = e
+
+
+def parse_loaded(parsers, batch_size=64, n_process=1):
+    """Run the extractors for parsers whose text is already loaded, batching NER"""
+    assign_person_entities(parsers, batch_size, n_process)
+    return [p._extract_all() for p in parsers]
+
+
+def jsonl_metrics_sink(path):
+    """Return a metrics sink appending each timing report as a JSON line to path"""
+    def sink(report):
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(report) + '\n')
+    return sink
+
+
 if __name__=='__main__':
-    if len(sys.argv) < 2:
-        print("Usage: python cv_parser.py <file>")
+    # --timings adds a _timings block to the output; CV_PARSER_METRICS_FILE
+    # appends the same report to a JSONL file instead of changing the output.
+    # --layout selects the layout-aware OCR mode (same as CV_PARSER_OCR_MODE=layout).
+    flags = {a for a in sys.argv[1:] if a.startswith('--')}
+    timings = '--timings' in flags or os.getenv('CV_PARSER_TIMINGS') == '1'
+    argv = [a for a in sys.argv if a not in flags]
+    if len(argv) < 2:
+        print("Usage: python cv_parser.py <file> [file_type] [user_id] [--timings] [--layout]")
         sys.exit(1)
     
-    file_path = sys.argv[1]
-    file_type = sys.argv[2] if len(sys.argv) > 2 else None
-    user_id = sys.argv[3] if len(sys.argv) > 3 else None
+    file_path = argv[1]
+    file_type = argv[2] if len(argv) > 2 else None
+    user_id = argv[3] if len(argv) > 3 else None
+    metrics_file = os.getenv('CV_PARSER_METRICS_FILE')
     
     logger.info(f"Starting CV parsing for file: {file_path}")
-    parser = CVParser(file_path)
+    parser = CVParser(file_path, timings=timings,
+                      metrics_sink=jsonl_metrics_sink(metrics_file) if metrics_file else None,
+                      ocr_mode='layout' if '--layout' in flags else None)
     print(json.dumps(parser.parse(), indent=2))
\ No newline at end of file
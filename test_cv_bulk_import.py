@@ -0,0 +1,149 @@
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+from bson.objectid import ObjectId
+from pymongo.errors import BulkWriteError
+
+from cv_bulk_import import BulkImporter, load_checkpoint
+
+
+class FakeCollection:
+    """Collection stand-in: find by _id/email $in, and bulk_write recording its batches"""
+
+    def __init__(self, emails=(), fail_indexes=()):
+        self.docs = [{'_id': ObjectId(), 'email': e} for e in emails]
+        self.fail_indexes = fail_indexes
+        self.batches = []
+
+    def find(self, query, projection=None):
+        (field, cond), = query.items()
+        return [d for d in self.docs if d[field] in cond['$in']]
+
+    def bulk_write(self, ops, ordered=True):
+        self.batches.append(ops)
+        if self.fail_indexes:
+            raise BulkWriteError({'writeErrors': [{'index': i, 'errmsg': 'duplicate key'} for i in self.fail_indexes],
+                                  'nMatched': len(ops) - len(self.fail_indexes), 'nModified': 0, 'nUpserted': 0})
+        upserts = sum(1 for op in ops if op._upsert)
+        return SimpleNamespace(matched_count=len(ops) - upserts, modified_count=len(ops) - upserts,
+                               upserted_count=upserts)
+
+
+class FakeDB(dict):
+    def __init__(self, emails=(), fail_indexes=()):
+        super().__init__(users=FakeCollection(emails, fail_indexes))
+
+    def __missing__(self, name):
+        self[name] = FakeCollection()
+        return self[name]
+
+
+def parsed(path, email='', user_id=None, error=None):
+    data = None if error else {'fullName': 'Jane Roe', 'email': email, 'phone': '', 'bio': '', 'skills': ['Python'],
+                               'experiences': [], 'certifications': [], 'languages': []}
+    return {'path': path, 'userId': user_id, 'data': data, 'pages': 1, 'seconds': 0.1, 'error': error}
+
+
+@pytest.fixture
+def ckpt(tmp_path):
+    return str(tmp_path / 'import.ckpt')
+
+
+def test_dry_run_leaves_checkpoint_untouched(ckpt):
+    importer = BulkImporter(None, ckpt)
+    for i in range(3):
+        importer.add(parsed(f'cv{i}.pdf', email=f'user{i}@example.com'))
+    importer.flush()
+    assert importer.stats['ok'] == 3
+    assert load_checkpoint(ckpt) == set()
+
+
+def test_unmatched_email_is_checkpointed_for_retry(ckpt):
+    db = FakeDB(['known@example.com'])
+    users = db['users']
+    importer = BulkImporter(db, ckpt)
+    importer.add(parsed('known.pdf', email='Known@Example.com'))
+    importer.add(parsed('later.pdf', email='later@example.com'))
+    importer.flush()
+
+    assert len(users.batches) == 1 and len(users.batches[0]) == 1
+    assert importer.stats['ok'] == 1 and importer.stats['unmatched'] == 1
+    assert load_checkpoint(ckpt) == {'known.pdf', 'later.pdf'}
+    assert load_checkpoint(ckpt, retry_failed=True) == {'known.pdf'}
+
+
+def test_profile_documents_are_upserted_per_user(ckpt):
+    db = FakeDB(['jane@example.com'])
+    result = parsed('jane.pdf', email='jane@example.com')
+    result['data']['experiences'] = [{'title': 'Developer', 'company': 'Acme', 'startDate': '2020-01-01',
+                                      'endDate': '2022-12-31', 'description': 'Built things'}]
+    result['data']['certifications'] = [{'name': 'AWS SAA', 'issuer': 'Amazon', 'date': 'Mar 2021'}]
+    importer = BulkImporter(db, ckpt)
+    importer.add(result)
+    importer.flush()
+
+    user_id = db['users'].docs[0]['_id']
+    (skill,), = db['skills'].batches
+    assert skill._filter == {'userId': user_id, 'name': 'Python'} and skill._upsert
+    (exp,), = db['experiences'].batches
+    assert exp._filter == {'userId': user_id, 'job_title': 'Developer', 'company': 'Acme'}
+    assert exp._doc['$setOnInsert']['start_date'] == datetime(2020, 1, 1)
+    assert exp._doc['$setOnInsert']['is_current'] is False
+    (cert,), = db['certifications'].batches
+    assert cert._doc['$setOnInsert']['obtained_date'] == datetime(2021, 3, 1)
+    assert importer.stats['skills_added'] == importer.stats['experiences_added'] == 1
+
+
+def test_resume_skips_checkpointed_files(ckpt):
+    db = FakeDB(['a@example.com', 'b@example.com'])
+    importer = BulkImporter(db, ckpt)
+    importer.add(parsed('a.pdf', email='a@example.com'))
+    importer.add(parsed('broken.pdf', error='cannot open'))
+    importer.add(parsed('noemail.pdf'))
+    importer.flush()
+    # Partially written last line of an interrupted run
+    with open(ckpt, 'a', encoding='utf-8') as f:
+        f.write('{"path": "b.pdf", "sta')
+
+    assert load_checkpoint(ckpt) == {'a.pdf', 'broken.pdf', 'noemail.pdf'}
+    assert load_checkpoint(ckpt, retry_failed=True) == {'a.pdf'}
+
+
+def test_retry_after_failure_marks_file_done(ckpt):
+    db = FakeDB(['a@example.com'])
+    importer = BulkImporter(db, ckpt)
+    importer.add(parsed('a.pdf', error='ocr failed'))
+    importer.flush()
+    importer.add(parsed('a.pdf', email='a@example.com'))
+    importer.flush()
+    assert load_checkpoint(ckpt, retry_failed=True) == {'a.pdf'}
+
+
+def test_bad_user_id_does_not_abort_batch(ckpt):
+    db = FakeDB()
+    user_id = ObjectId()
+    db['users'].docs.append({'_id': user_id, 'email': 'x@example.com'})
+    importer = BulkImporter(db, ckpt)
+    importer.add(parsed('bad.pdf', user_id='not-an-id'))
+    importer.add(parsed('good.pdf', user_id=str(user_id)))
+    importer.flush()
+
+    (op,), = db['users'].batches
+    assert op._filter == {'_id': user_id}
+    assert importer.stats['failed'] == 1 and importer.stats['ok'] == 1
+    assert load_checkpoint(ckpt, retry_failed=True) == {'good.pdf'}
+
+
+def test_bulk_write_error_is_attributed_by_index(ckpt):
+    emails = [f'u{i}@example.com' for i in range(4)]
+    # u1 matches no user, so it is not sent and index 2 of the batch is u3
+    db = FakeDB([e for e in emails if e != 'u1@example.com'], fail_indexes=[2])
+    importer = BulkImporter(db, ckpt)
+    for i in range(4):
+        importer.add(parsed(f'u{i}.pdf', email=emails[i]))
+    importer.flush()
+
+    assert [op._filter['_id'] for op in db['users'].batches[0]] == [d['_id'] for d in db['users'].docs]
+    assert importer.stats['failed'] == 1 and importer.stats['unmatched'] == 1 and importer.stats['ok'] == 2
+    assert load_checkpoint(ckpt, retry_failed=True) == {'u0.pdf', 'u2.pdf'}
@@ -0,0 +1,92 @@
+from PIL import Image, ImageDraw
+
+from cv_parser_ocr import CVParser, content_bbox, find_gutter, layout_lines, order_lines
+
+
+def line(text, left, top, right, height=20):
+    return {'text': text, 'left': left, 'top': top, 'right': right, 'bottom': top + height}
+
+
+def ocr_data(words):
+    """image_to_data DICT output from (text, conf, block, par, line, left, top, width, height) tuples"""
+    keys = ['text', 'conf', 'block_num', 'par_num', 'line_num', 'left', 'top', 'width', 'height']
+    return {k: [w[i] for w in words] for i, k in enumerate(keys)}
+
+
+def test_content_bbox_blank_page():
+    assert content_bbox(Image.new('RGB', (200, 100), 'white')) is None
+
+
+def test_content_bbox_adds_margin_within_page():
+    img = Image.new('RGB', (200, 100), 'white')
+    ImageDraw.Draw(img).rectangle([50, 40, 80, 60], fill='black')
+    assert content_bbox(img, margin=10) == (40, 30, 91, 71)
+    ImageDraw.Draw(img).rectangle([0, 0, 3, 3], fill='black')
+    assert content_bbox(img, margin=10)[:2] == (0, 0)
+
+
+def test_layout_lines_groups_words_and_drops_low_confidence_blocks():
+    data = ocr_data([
+        ('Jane', 95, 1, 1, 1, 10, 10, 40, 20),
+        ('Roe', 92, 1, 1, 1, 60, 12, 30, 20),
+        ('', -1, 1, 1, 2, 0, 0, 0, 0),
+        ('Python', 90, 1, 1, 2, 10, 40, 60, 20),
+        ('~#', 12, 2, 1, 1, 300, 10, 30, 30),
+        ('}{', 20, 2, 1, 1, 340, 10, 30, 30),
+    ])
+    assert layout_lines(data) == [
+        {'text': 'Jane Roe', 'left': 10, 'top': 10, 'right': 90, 'bottom': 32},
+        {'text': 'Python', 'left': 10, 'top': 40, 'right': 70, 'bottom': 60},
+    ]
+
+
+def two_columns():
+    lines = [line('Jane Roe', 50, 20, 950)]
+    for i in range(6):
+        lines.append(line(f'left {i}', 50, 100 + 40 * i, 420))
+        lines.append(line(f'right {i}', 560, 100 + 40 * i, 940))
+    return lines
+
+
+def test_find_gutter_two_columns():
+    gutter = find_gutter(two_columns(), 1000)
+    assert gutter is not None and 420 <= gutter <= 560
+
+
+def test_find_gutter_single_column():
+    lines = [line(f'text {i}', 50, 100 + 40 * i, 900) for i in range(8)]
+    assert find_gutter(lines, 1000) is None
+
+
+def test_find_gutter_ignores_right_aligned_dates():
+    # Single column where every job title has a date in the same format on its row
+    lines = []
+    for i in range(4):
+        top = 100 + 120 * i
+        lines.append(line('Developer - Acme', 50, top, 350))
+        lines.append(line('2019 - 2021', 820, top + 2, 950))
+        lines.append(line('- did things', 50, top + 40, 400))
+    assert find_gutter(lines, 1000) is None
+
+
+def test_order_lines_reads_left_column_first():
+    assert order_lines(two_columns(), 490) == (
+        ['Jane Roe'] + [f'left {i}' for i in range(6)] + [f'right {i}' for i in range(6)])
+
+
+def test_order_lines_without_gutter_is_top_to_bottom():
+    lines = [line('b', 50, 40, 100), line('date', 800, 10, 900), line('a', 50, 10, 100)]
+    assert order_lines(lines, None) == ['a', 'date', 'b']
+
+
+def test_dates_keep_their_experience():
+    lines = []
+    for i, (title, company) in enumerate([('Developer', 'Acme'), ('Engineer', 'Globex'), ('Intern', 'Initech')]):
+        top = 100 + 120 * i
+        lines += [line(f'{title} - {company}', 50, top, 350), line('2019 - 2021', 820, top + 2, 950),
+                  line('- did things', 50, top + 40, 400)]
+    lines.insert(0, line('EXPERIENCE', 50, 60, 250))
+    text = '\n'.join(order_lines(lines, find_gutter(lines, 1000)))
+    data = CVParser('<test>').parse_text(text)
+    assert [(e['title'], e['company']) for e in data['experiences']] == [
+        ('Developer', 'Acme'), ('Engineer', 'Globex'), ('Intern', 'Initech')]
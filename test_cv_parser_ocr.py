@@ -0,0 +1,46 @@
+import pytesseract
+from PIL import Image
+
+import cv_parser_ocr
+from cv_parser_ocr import CVParser
+
+
+def test_text_source_ocr(tmp_path, monkeypatch):
+    path = str(tmp_path / 'cv.png')
+    Image.new('RGB', (20, 20), 'white').save(path)
+    monkeypatch.setattr(pytesseract, 'image_to_string', lambda img: 'Jane Roe\njane.roe@example.com')
+    parser = CVParser(path)
+    parser.load_text()
+    assert parser.text_source == 'ocr'
+
+
+def test_text_source_fallback_when_ocr_fails(tmp_path, monkeypatch):
+    path = str(tmp_path / 'cv.png')
+    Image.new('RGB', (20, 20), 'white').save(path)
+
+    def fail(img):
+        raise pytesseract.TesseractNotFoundError()
+    monkeypatch.setattr(pytesseract, 'image_to_string', fail)
+    parser = CVParser(path)
+    parser.load_text()
+    assert parser.text_source == 'fallback'
+
+
+def test_batched_extraction_scans_text_once(monkeypatch):
+    calls = []
+    email_re = cv_parser_ocr.EMAIL_RE
+
+    class CountingRe:
+        def search(self, text):
+            calls.append(text)
+            return email_re.search(text)
+    monkeypatch.setattr(cv_parser_ocr, 'EMAIL_RE', CountingRe())
+    texts = ['Jane Roe\njane.roe@example.com', 'John Doe\nno email here']
+    parsers = [CVParser('<test>').set_text(t) for t in texts]
+    data = cv_parser_ocr.parse_loaded(parsers)
+    assert calls == texts
+    assert data[0]['email'] == 'jane.roe@example.com'
+
+    # New text on the same parser is scanned again
+    parsers[0].set_text('Other\nother.person@example.com')
+    assert parsers[0]._extract_all()['email'] == 'other.person@example.com'
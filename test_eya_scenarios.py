@@ -0,0 +1,118 @@
+import io
+import os
+import sys
+from contextlib import redirect_stdout
+
+import numpy as np
+import pytest
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+from mongo_standin import InMemoryCollection
+from datagen import eya_dataset
+
+
+@pytest.fixture(scope='module')
+def eya():
+    # Eya.py charge ses .pkl depuis le dossier courant et affiche chaque document lu
+    cwd = os.getcwd()
+    os.chdir(ROOT)
+    try:
+        with redirect_stdout(io.StringIO()):
+            import Eya
+    finally:
+        os.chdir(cwd)
+    return Eya
+
+
+@pytest.fixture
+def client(eya):
+    project_id, data = eya_dataset(5, 20, seed=3)
+    eya.projects_collection = InMemoryCollection(data['projects'])
+    eya.resources_collection = InMemoryCollection(data['ressources'])
+    eya.workspaces_collection = InMemoryCollection(data['workspaces'])
+    test_client = eya.app.test_client()
+
+    def post(body):
+        with redirect_stdout(io.StringIO()):
+            return test_client.post('/predict/scenarios', json={'projectId': str(project_id), **body})
+    return post
+
+
+@pytest.fixture
+def base_row(eya):
+    return {f: float(i + 1) for i, f in enumerate(eya.features)}
+
+
+def test_grid(client):
+    resp = client({'grid': {'duration_days': [30, 60, 90], 'team_size': [2, 5]}})
+    assert resp.status_code == 200
+    body = resp.get_json()
+    assert body['count'] == 6
+    assert [s['overrides'] for s in body['scenarios']][:2] == [
+        {'duration_days': 30, 'team_size': 2}, {'duration_days': 30, 'team_size': 5}]
+    for s in body['scenarios']:
+        assert s['is_delayed'] in ('En retard', 'À temps')
+        assert s['time_diff'] >= 0
+    assert set(body['base']) == {'features', 'is_delayed', 'time_diff'}
+
+
+def test_overrides(client):
+    overrides = [{'duration_days': 45}, {'team_size': 3, 'allocated_cost': 12000.0}]
+    resp = client({'overrides': overrides})
+    assert resp.status_code == 200
+    body = resp.get_json()
+    assert body['count'] == 2
+    assert [s['overrides'] for s in body['scenarios']] == overrides
+
+
+def test_unknown_feature(client):
+    resp = client({'grid': {'not_a_feature': [1, 2]}})
+    assert resp.status_code == 400
+    assert 'not_a_feature' in resp.get_json()['error']
+
+
+def test_non_numeric_value(client):
+    assert client({'overrides': [{'duration_days': 'longtemps'}]}).status_code == 400
+    assert client({'grid': {'team_size': [1, 'deux']}}).status_code == 400
+
+
+def test_null_and_non_finite_values(client):
+    resp = client({'grid': {'team_size': [1, None]}})
+    assert resp.status_code == 400
+    assert 'team_size' in resp.get_json()['error']
+    assert client({'overrides': [{'duration_days': 30}, {'team_size': None}]}).status_code == 400
+    assert client({'overrides': [{'allocated_cost': 'inf'}]}).status_code == 400
+    assert client({'grid': {'duration_days': ['nan']}}).status_code == 400
+
+
+def test_oversized_grid(client):
+    # 40**12 déborde en int64 : doit être refusé avant de construire le produit
+    resp = client({'grid': {f'f{i}': list(range(40)) for i in range(12)}})
+    assert resp.status_code == 400
+    assert '16777216000000000000 variantes' in resp.get_json()['error']
+
+
+def test_empty_requests(client):
+    assert client({'grid': {'team_size': []}}).status_code == 400
+    assert client({'overrides': []}).status_code == 400
+    assert client({}).status_code == 400
+
+
+def test_cost_ratio_recomputed(eya, base_row):
+    matrix, _ = eya.build_scenarios(base_row, {'grid': {'allocated_cost': [10.0, 40.0]}})
+    est = base_row['estimated_cost']
+    np.testing.assert_allclose(matrix[:, eya.features.index('cost_ratio')], [10.0 / est, 40.0 / est])
+
+
+def test_explicit_cost_ratio_kept(eya, base_row):
+    matrix, _ = eya.build_scenarios(base_row, {'overrides': [{'allocated_cost': 10.0, 'cost_ratio': 7.0}]})
+    assert matrix[0, eya.features.index('cost_ratio')] == 7.0
+
+
+def test_cost_ratio_decided_per_variant(eya, base_row):
+    overrides = [{'allocated_cost': 80.0}, {'cost_ratio': 2.0}, {'duration_days': 5.0}]
+    matrix, _ = eya.build_scenarios(base_row, {'overrides': overrides})
+    ratio = matrix[:, eya.features.index('cost_ratio')]
+    np.testing.assert_allclose(ratio, [80.0 / base_row['estimated_cost'], 2.0, base_row['cost_ratio']])